@@ -94,8 +94,10 @@ MENUITEMS = (
 PLUGIN_PATHS = ['plugins']
 PLUGINS = [
     'sitemap',
+    'api_client',  # Shared HTTP client, must load before the integrations
     'youtube_integration',
     'github_integration',
+    'remote_images',  # Mirrors integration video thumbnails, must load after them
     'seo_enhancement',
 ]
 
@@ -138,9 +140,54 @@ DISPLAY_TAGS_ON_SIDEBAR = False
 # YouTube Integration Settings
 YOUTUBE_CHANNEL_USERNAME = 'BryanHoward'
 YOUTUBE_CHANNEL_ID = ''  # Optional: Set if you know your channel ID
+YOUTUBE_MAX_VIDEOS = 6  # Details are fetched in batches of 50 ids
+# 'feed' lists uploads from the free channel Atom feed (up to 15) and only
+# asks the Data API about new or changed videos; 'api' uses playlistItems
+YOUTUBE_VIDEO_SOURCE = 'api'
+# Render video cards and YouTube iframes in content as a thumbnail facade that
+# only loads the player when clicked
+YOUTUBE_LITE_EMBEDS = True
+# Quota planner: optional fetches (playlists, video details) stop at the low
+# watermark and required calls stop at the reserve, leaving headroom on the key
+YOUTUBE_DAILY_QUOTA = 10000
+YOUTUBE_QUOTA_LOW_WATERMARK = 2000
+YOUTUBE_QUOTA_RESERVE = 500
+YOUTUBE_REFRESH_BUDGET = 30  # Seconds to refresh stale data before rendering the snapshot
+# YOUTUBE_SNAPSHOT_TTLS = {'channel': 3600, 'videos': 10800, 'playlists': 86400}
 
 # GitHub Integration Settings  
 GITHUB_USERNAME = 'bhowiebkr'
+# Responses are cached under CACHE_PATH/github and revalidated with ETags
+# GITHUB_CACHE_TTLS = {'profile': 3600, 'repos': 3600, 'events': 900}
+GITHUB_CACHE_MAX_BYTES = 5 * 1024 * 1024
+GITHUB_MAX_WORKERS = 8  # Concurrent repository detail requests
+GITHUB_SKIP_ARCHIVED = True
+# Homepage repos are the top 8 across all pages by this score
+GITHUB_REPO_SCORE_WEIGHTS = {'stars': 1.0, 'pushed_at': 10.0, 'topics': 0.5}
+GITHUB_API_MODE = 'rest'  # 'graphql' fetches profile and repos in one query (needs GITHUB_TOKEN)
+GITHUB_REFRESH_BUDGET = 30  # Seconds to refresh stale data before rendering the snapshot
+# GITHUB_SNAPSHOT_TTLS = {'profile': 3600, 'repositories': 21600, 'activity': 1800}
+
+# Shared API Client Settings (used by the YouTube and GitHub plugins)
+API_CLIENT_MAX_RETRIES = 3
+API_CLIENT_RATE_LIMIT_RESERVE = 10  # Stop this many requests before the quota runs out
+API_CLIENT_MAX_WAIT = 60  # Longest wait in seconds for a rate limit window to reset
+API_CLIENT_RATES = {'api.github.com': 10, 'www.googleapis.com': 10}  # Requests per second
+# 'live', 'record' or 'replay' (the API_RECORD_MODE environment variable overrides this)
+API_RECORD_MODE = 'live'
+API_CASSETTE_PATH = 'cassettes'
+API_REPLAY_STRICT = True  # Fail the build when replay finds no cassette for a request
+
+# Remote Images Settings
+# YouTube video thumbnails are downloaded at build time through the shared API
+# client, cached under CACHE_PATH/remote_images and served from
+# theme/images/remote/ as WebP at these widths plus a JPEG fallback (Pillow).
+# Record/replay builds skip mirroring and keep the remote URLs
+REMOTE_IMAGES_ENABLED = True
+REMOTE_IMAGES_WIDTHS = [160, 320, 480]
+REMOTE_IMAGES_QUALITY = 80
+REMOTE_IMAGES_MAX_AGE = 7 * 24 * 3600  # Seconds before a mirrored URL is downloaded again
+REMOTE_IMAGES_MAX_WORKERS = 8
 
 # Analytics settings removed
 
@@ -0,0 +1,5 @@
+from .client import APIClient, get_client, register
+from .cache import HTTPCache
+from .cassette import CassetteMissingError, get_record_mode
+from .ratelimit import RateLimitExceeded
+from .snapshot import Snapshot, snapshot_path
\ No newline at end of file
@@ -0,0 +1,197 @@
+"""
+On-disk HTTP response cache for API integrations
+Stores responses with their ETag/Last-Modified validators so later builds
+can revalidate with conditional requests instead of re-downloading
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import requests
+
+from .ratelimit import RateLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth keeping; 404 covers repos without a latest release
+CACHEABLE_STATUS_CODES = (200, 404)
+
+
+class CachedResponse:
+    """Minimal response object for data served from the cache"""
+
+    def __init__(self, status_code, data, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.headers = headers or {}
+
+    def json(self):
+        return self._data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} (cached)", response=self)
+
+
+class HTTPCache:
+    """JSON-file response cache with per-endpoint TTLs and LRU eviction
+
+    Safe to share between worker threads; the network request itself runs
+    outside the lock.
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir, ttls=None, default_ttl=3600, max_bytes=5 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'revalidated': 0, 'stale': 0, 'misses': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.index = self._load_index()
+
+    @staticmethod
+    def make_key(url, params=None):
+        """Build a stable cache key from the URL and query parameters"""
+        items = sorted((params or {}).items())
+        raw = url + '?' + '&'.join(f'{k}={v}' for k, v in items)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, session_get, url, endpoint, headers=None, params=None, timeout=10):
+        """Fetch a URL through the cache
+
+        Fresh entries are served without a request; stale entries are
+        revalidated with If-None-Match/If-Modified-Since and a 304 is
+        served from disk. If the client refuses to spend the remaining
+        rate limit, a stale entry is served rather than failing.
+        """
+        key = self.make_key(url, params)
+        with self._lock:
+            entry = self._read_entry(key)
+        ttl = self.ttls.get(endpoint, self.default_ttl)
+
+        if entry and time.time() - entry['fetched_at'] < ttl:
+            with self._lock:
+                self.stats['hits'] += 1
+                self._touch(key)
+            return CachedResponse(entry['status_code'], entry['data'], entry.get('headers'))
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = session_get(url, headers=request_headers, params=params, timeout=timeout)
+        except RateLimitExceeded:
+            if not entry:
+                raise
+            logger.warning(f"Rate limit reached, serving stale cached response for {url}")
+            with self._lock:
+                self.stats['stale'] += 1
+            return CachedResponse(entry['status_code'], entry['data'], entry.get('headers'))
+
+        if response.status_code == 304 and entry:
+            entry['fetched_at'] = time.time()
+            with self._lock:
+                self.stats['revalidated'] += 1
+                self._write_entry(key, entry)
+            return CachedResponse(entry['status_code'], entry['data'], entry.get('headers'))
+
+        with self._lock:
+            self.stats['misses'] += 1
+        if response.status_code in CACHEABLE_STATUS_CODES:
+            try:
+                data = response.json()
+            except ValueError:
+                return response
+            with self._lock:
+                self._write_entry(key, {
+                    'url': url,
+                    'params': params or {},
+                    'status_code': response.status_code,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'headers': {'Link': response.headers['Link']} if 'Link' in response.headers else {},
+                    'fetched_at': time.time(),
+                    'data': data
+                })
+        return response
+
+    def save(self):
+        """Persist the LRU index"""
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        try:
+            with self._lock, open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f)
+        except OSError as e:
+            logger.warning(f"Could not write HTTP cache index: {e}")
+
+    def log_stats(self, name):
+        """Log hit/miss counters for this build"""
+        stats = self.stats
+        total = stats['hits'] + stats['revalidated'] + stats['stale'] + stats['misses']
+        logger.info(
+            f"{name} HTTP cache: {stats['hits']} hits, {stats['revalidated']} revalidated (304), "
+            f"{stats['stale']} stale, {stats['misses']} misses, {stats['evictions']} evictions "
+            f"({total} lookups)"
+        )
+
+    def _load_index(self):
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.json')
+
+    def _read_entry(self, key):
+        if key not in self.index:
+            return None
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            self.index.pop(key, None)
+            return None
+
+    def _write_entry(self, key, entry):
+        payload = json.dumps(entry)
+        try:
+            with open(self._entry_path(key), 'w', encoding='utf-8') as f:
+                f.write(payload)
+        except OSError as e:
+            logger.warning(f"Could not write HTTP cache entry for {entry['url']}: {e}")
+            return
+        self.index[key] = {'size': len(payload), 'last_access': time.time()}
+        self._evict()
+
+    def _touch(self, key):
+        if key in self.index:
+            self.index[key]['last_access'] = time.time()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        total = sum(meta['size'] for meta in self.index.values())
+        if total <= self.max_bytes:
+            return
+        for key, meta in sorted(self.index.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._entry_path(key))
+            except OSError:
+                pass
+            total -= meta['size']
+            del self.index[key]
+            self.stats['evictions'] += 1
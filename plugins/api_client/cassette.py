@@ -0,0 +1,119 @@
+"""
+Record/replay cassettes for the shared API client
+Stores normalized request -> response pairs on disk so builds can run
+reproducibly without network access
+"""
+
+import os
+import json
+import hashlib
+import logging
+from urllib.parse import urlsplit, parse_qsl
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+MODES = ('live', 'record', 'replay')
+
+# Query parameters that carry credentials and never end up in a cassette
+SECRET_PARAMS = ('key', 'access_token', 'client_secret')
+
+# Response headers kept in cassettes
+RECORDED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link')
+
+
+class CassetteMissingError(Exception):
+    """Raised in strict replay mode when a request has no recorded response"""
+
+
+class CassetteStore:
+    """Directory of recorded responses for one client"""
+
+    def __init__(self, path, strict=True):
+        self.path = path
+        self.strict = strict
+        self.played = 0
+        self.recorded = 0
+
+    @staticmethod
+    def normalize(method, url, params=None, json_body=None):
+        """Reduce a request to the fields that identify its response"""
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query))
+        query.update({k: str(v) for k, v in (params or {}).items() if v is not None})
+        for secret in SECRET_PARAMS:
+            query.pop(secret, None)
+
+        return {
+            'method': method.upper(),
+            'url': f'{parts.scheme}://{parts.netloc}{parts.path}',
+            'params': dict(sorted(query.items())),
+            'body': json_body
+        }
+
+    def key(self, request):
+        raw = json.dumps(request, sort_keys=True)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+    def play(self, method, url, params=None, json_body=None):
+        """Return the recorded response, or None outside strict mode"""
+        request = self.normalize(method, url, params, json_body)
+        cassette_path = os.path.join(self.path, f'{self.key(request)}.json')
+        try:
+            with open(cassette_path, 'r', encoding='utf-8') as f:
+                cassette = json.load(f)
+        except FileNotFoundError:
+            if self.strict:
+                raise CassetteMissingError(
+                    f"No cassette for {request['method']} {request['url']} {request['params']} "
+                    f"(expected {cassette_path}); record it with API_RECORD_MODE=record"
+                )
+            return None
+
+        self.played += 1
+        return self._build_response(url, cassette['response'])
+
+    def record(self, method, url, response, params=None, json_body=None):
+        request = self.normalize(method, url, params, json_body)
+        cassette = {
+            'request': request,
+            'response': {
+                'status_code': response.status_code,
+                'headers': {
+                    name: response.headers[name]
+                    for name in RECORDED_HEADERS if name in response.headers
+                },
+                'body': response.text
+            }
+        }
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(os.path.join(self.path, f'{self.key(request)}.json'), 'w', encoding='utf-8') as f:
+                json.dump(cassette, f, indent=2, sort_keys=True)
+            self.recorded += 1
+        except OSError as e:
+            logger.warning(f"Could not write cassette for {request['url']}: {e}")
+
+    @staticmethod
+    def _build_response(url, recorded):
+        response = requests.Response()
+        response.status_code = recorded['status_code']
+        response.headers = CaseInsensitiveDict(recorded.get('headers', {}))
+        response._content = recorded['body'].encode('utf-8')
+        # Lets iter_content() stream the recorded body
+        response._content_consumed = True
+        response.encoding = 'utf-8'
+        response.reason = 'Replayed'
+        response.url = url
+        return response
+
+
+def get_record_mode(settings):
+    """Record mode from the API_RECORD_MODE environment variable or setting"""
+    mode = os.environ.get('API_RECORD_MODE') or settings.get('API_RECORD_MODE', 'live')
+    mode = mode.lower()
+    if mode not in MODES:
+        raise ValueError(f"API_RECORD_MODE must be one of {', '.join(MODES)}, got {mode!r}")
+    return mode
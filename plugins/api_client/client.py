@@ -0,0 +1,298 @@
+"""
+Shared HTTP client for the API integration plugins
+Pools connections per host, retries transient failures with jittered
+exponential backoff and paces requests against the provider's rate limit
+"""
+
+import os
+import time
+import random
+import logging
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from pelican import signals
+
+from .cassette import CassetteStore, get_record_mode
+from .ratelimit import RateLimitExceeded, TokenBucket
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Clients shared by every plugin for the lifetime of the process
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+class HostStats:
+    """Latency and retry counters for one host"""
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.throttled = 0.0
+        self.latencies = []
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        if latencies:
+            mean = sum(latencies) / len(latencies)
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            timing = f"avg {mean * 1000:.0f}ms, p95 {p95 * 1000:.0f}ms, max {latencies[-1] * 1000:.0f}ms"
+        else:
+            timing = "no completed requests"
+        return (
+            f"{self.requests} requests, {self.retries} retries, {self.errors} errors, "
+            f"{self.throttled:.1f}s throttled, {timing}"
+        )
+
+
+class APIClient:
+    """Pooled, rate-limit-aware HTTP client for one integration"""
+
+    def __init__(self, name, settings, cache=None):
+        self.name = name
+        self.cache = cache
+        self.timeout = settings.get('API_CLIENT_TIMEOUT', 10)
+        self.max_retries = settings.get('API_CLIENT_MAX_RETRIES', 3)
+        self.backoff_base = settings.get('API_CLIENT_BACKOFF_BASE', 0.5)
+        self.backoff_cap = settings.get('API_CLIENT_BACKOFF_CAP', 30)
+        self.max_wait = settings.get('API_CLIENT_MAX_WAIT', 60)
+        self.reserve = settings.get('API_CLIENT_RATE_LIMIT_RESERVE', 10)
+        self.rates = settings.get('API_CLIENT_RATES', {})
+        self.default_rate = settings.get('API_CLIENT_DEFAULT_RATE', 10)
+
+        pool_size = settings.get('API_CLIENT_POOL_SIZE', 10)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # live, record or replay; see cassette.py
+        self.mode = get_record_mode(settings)
+        self.cassettes = None
+        if self.mode != 'live':
+            self.cassettes = CassetteStore(
+                os.path.join(settings.get('API_CASSETTE_PATH', 'cassettes'), name.lower()),
+                strict=settings.get('API_REPLAY_STRICT', True)
+            )
+
+        self._buckets = {}
+        self._quota = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, headers=None, endpoint=None, timeout=None):
+        """GET a URL, through the response cache when the client has one
+
+        The cache is bypassed when recording or replaying so cassettes
+        always hold complete responses.
+        """
+        if self.cache is not None and endpoint is not None and self.mode == 'live':
+            return self.cache.get(self._cache_get, url, endpoint, headers=headers, params=params,
+                                  timeout=timeout or self.timeout)
+        return self.request('GET', url, params=params, headers=headers, timeout=timeout)
+
+    def paginate(self, url, params=None, headers=None, endpoint=None):
+        """Yield items from every page of a list endpoint, following Link headers
+
+        Only one page is held in memory at a time.
+        """
+        while url:
+            response = self.get(url, params=params, headers=headers, endpoint=endpoint)
+            response.raise_for_status()
+            yield from response.json()
+
+            # The next link already carries the query string
+            url = next_link(response)
+            params = None
+
+    def iter_content(self, url, params=None, headers=None, chunk_size=16 * 1024):
+        """Yield the body of a GET in chunks without buffering the whole response"""
+        response = self.request('GET', url, params=params, headers=headers, stream=True)
+        with response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size)
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        """POST a JSON body"""
+        return self.request('POST', url, json=json, headers=headers, timeout=timeout)
+
+    def request(self, method, url, timeout=None, **kwargs):
+        """Send a request, pacing it and retrying transient failures"""
+        if self.mode == 'replay':
+            response = self.cassettes.play(method, url, kwargs.get('params'), kwargs.get('json'))
+            if response is not None:
+                return response
+
+        host = urlparse(url).netloc
+        stats = self._host_stats(host)
+        attempt = 0
+
+        while True:
+            self._check_quota(host)
+            stats.throttled += self._bucket(host).acquire()
+
+            started = time.monotonic()
+            try:
+                response = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                with self._lock:
+                    stats.requests += 1
+                    stats.errors += 1
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.debug(f"{self.name}: {e.__class__.__name__} for {host}, retrying in {delay:.1f}s")
+            else:
+                with self._lock:
+                    stats.requests += 1
+                    stats.latencies.append(time.monotonic() - started)
+                self._update_quota(host, response)
+
+                delay = self._retry_delay(host, response, attempt)
+                if delay is None:
+                    if response.status_code >= 500:
+                        with self._lock:
+                            stats.errors += 1
+                    if self.mode == 'record':
+                        self.cassettes.record(method, url, response, kwargs.get('params'), kwargs.get('json'))
+                    return response
+                logger.debug(f"{self.name}: {response.status_code} from {host}, retrying in {delay:.1f}s")
+
+            with self._lock:
+                stats.retries += 1
+            attempt += 1
+            time.sleep(delay)
+
+    def log_stats(self):
+        """Log per-host latency and retry statistics, then reset them"""
+        with self._lock:
+            stats, self._stats = self._stats, {}
+        for host, host_stats in sorted(stats.items()):
+            logger.info(f"{self.name} API {host}: {host_stats.summary()}")
+        if self.cassettes is not None:
+            logger.info(
+                f"{self.name} cassettes ({self.mode}): {self.cassettes.played} replayed, "
+                f"{self.cassettes.recorded} recorded"
+            )
+            self.cassettes.played = self.cassettes.recorded = 0
+
+    def _cache_get(self, url, headers=None, params=None, timeout=None):
+        return self.request('GET', url, headers=headers, params=params, timeout=timeout)
+
+    def _host_stats(self, host):
+        with self._lock:
+            return self._stats.setdefault(host, HostStats())
+
+    def _bucket(self, host):
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rates.get(host, self.default_rate))
+            return self._buckets[host]
+
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def _retry_delay(self, host, response, attempt):
+        """Seconds to wait before retrying, or None if the response is final"""
+        status = response.status_code
+        exhausted = status == 403 and response.headers.get('X-RateLimit-Remaining') == '0'
+        if status not in RETRY_STATUS_CODES and not exhausted:
+            return None
+        if attempt >= self.max_retries:
+            if exhausted or status == 429:
+                raise RateLimitExceeded(f"{self.name}: rate limit exceeded for {host}")
+            return None
+
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = self._backoff(attempt)
+        elif exhausted:
+            delay = self._reset_in(host)
+        else:
+            delay = self._backoff(attempt)
+
+        if delay > self.max_wait:
+            raise RateLimitExceeded(
+                f"{self.name}: {host} asked to wait {delay:.0f}s, more than API_CLIENT_MAX_WAIT"
+            )
+        return delay
+
+    def _update_quota(self, host, response):
+        """Track X-RateLimit-Remaining/Reset and pace the host accordingly"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining, reset = int(remaining), float(reset)
+        except ValueError:
+            return
+
+        with self._lock:
+            self._quota[host] = (remaining, reset)
+        self._bucket(host).pace(remaining, reset - time.time(), self.reserve)
+
+    def _reset_in(self, host):
+        with self._lock:
+            _, reset = self._quota.get(host, (None, time.time()))
+        return max(0.0, reset - time.time())
+
+    def _check_quota(self, host):
+        """Wait for the window to reset, or stop, when the quota reserve is reached"""
+        with self._lock:
+            remaining, _ = self._quota.get(host, (None, None))
+        if remaining is None or remaining > self.reserve:
+            return
+
+        wait = self._reset_in(host)
+        if wait > self.max_wait:
+            raise RateLimitExceeded(
+                f"{self.name}: only {remaining} requests left for {host}, resets in {wait:.0f}s"
+            )
+        if wait > 0:
+            logger.info(f"{self.name}: rate limit reserve reached for {host}, waiting {wait:.0f}s")
+            self._host_stats(host).throttled += wait
+            time.sleep(wait)
+        with self._lock:
+            self._quota.pop(host, None)
+
+
+def next_link(response):
+    """Return the rel="next" URL from a response's Link header, if any"""
+    for link in requests.utils.parse_header_links(response.headers.get('Link', '')):
+        if link.get('rel') == 'next':
+            return link.get('url')
+    return None
+
+
+def get_client(name, settings, cache_factory=None):
+    """Return the shared client for an integration, creating it on first use"""
+    with _clients_lock:
+        if name not in _clients:
+            cache = cache_factory() if cache_factory else None
+            _clients[name] = APIClient(name, settings, cache=cache)
+        return _clients[name]
+
+
+def report_stats(pelican):
+    """Log client and cache statistics at the end of the build"""
+    for client in list(_clients.values()):
+        client.log_stats()
+        if client.cache is not None:
+            client.cache.log_stats(client.name)
+            client.cache.save()
+
+
+def register():
+    """Register the plugin"""
+    signals.finalized.connect(report_stats)
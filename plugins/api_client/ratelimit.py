@@ -0,0 +1,43 @@
+"""
+Rate limiting helpers for the shared API client
+"""
+
+import time
+import threading
+
+
+class RateLimitExceeded(Exception):
+    """Raised instead of sending a request that would exhaust the API quota"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket that paces requests to a host"""
+
+    def __init__(self, rate, capacity=None):
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and return the seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def pace(self, remaining, reset_in, reserve):
+        """Slow down so the remaining quota lasts until the window resets"""
+        with self._lock:
+            budget = max(remaining - reserve, 1)
+            self.rate = min(self.base_rate, budget / max(reset_in, 1))
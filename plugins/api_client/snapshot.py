@@ -0,0 +1,151 @@
+"""
+Stale-while-revalidate snapshots of integration data
+Keeps the last good value of every resource on disk so builds can render
+immediately and only refresh what is stale, within a time budget
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .cassette import CassetteMissingError
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored data shape changes; older snapshots are discarded
+SNAPSHOT_VERSION = 1
+
+
+class Snapshot:
+    """Versioned per-resource snapshot of one integration's dataset"""
+
+    def __init__(self, name, path, ttls=None, default_ttl=3600, refresh_all=False):
+        self.name = name
+        self.path = path
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        # Record/replay builds refetch everything so output depends only on cassettes
+        self.refresh_all = refresh_all
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.resources = self._load()
+
+    def get(self, resource):
+        """Return the last good value of a resource, or None"""
+        with self._lock:
+            entry = self.resources.get(resource)
+        return entry['data'] if entry else None
+
+    def is_fresh(self, resource):
+        if self.refresh_all:
+            return False
+        with self._lock:
+            entry = self.resources.get(resource)
+        ttl = self.ttls.get(resource, self.default_ttl)
+        return bool(entry) and time.time() - entry['fetched_at'] < ttl
+
+    def needs_refresh(self, resources):
+        return not all(self.is_fresh(resource) for resource in resources)
+
+    def update(self, resource, data):
+        with self._lock:
+            self.resources[resource] = {'data': data, 'fetched_at': time.time()}
+
+    def refresh(self, fetchers, budget):
+        """Refresh stale resources concurrently within a time budget
+
+        fetchers maps a resource name, or a tuple of names fetched together,
+        to a callable returning the value (or a tuple of values). Failed
+        resources keep their snapshot value; fetches still running when the
+        budget runs out update the snapshot for the next build.
+        """
+        stale = {
+            key: fetch for key, fetch in fetchers.items()
+            if self.needs_refresh(self._names(key))
+        }
+
+        if stale:
+            executor = ThreadPoolExecutor(max_workers=len(stale))
+            futures = {executor.submit(fetch): key for key, fetch in stale.items()}
+            done, pending = wait(futures, timeout=budget)
+
+            for future in done:
+                self._store_result(futures[future], future)
+
+            for future in pending:
+                key = futures[future]
+                logger.warning(f"{self.name} {key} not refreshed within {budget}s, rendering from snapshot")
+                future.add_done_callback(partial(self._store_late_result, key))
+
+            executor.shutdown(wait=False)
+            self.save()
+
+        data = {}
+        for key in fetchers:
+            for name in self._names(key):
+                data[name] = self.get(name)
+        return data
+
+    def save(self):
+        # Late refresh callbacks can save at the same time as the build, so
+        # saves are serialized; each writes a full payload atomically
+        with self._save_lock:
+            with self._lock:
+                content = json.dumps({
+                    'version': SNAPSHOT_VERSION,
+                    'saved_at': time.time(),
+                    'resources': self.resources
+                })
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f'{self.path}.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not save {self.name} snapshot: {e}")
+
+    @staticmethod
+    def _names(key):
+        return key if isinstance(key, tuple) else (key,)
+
+    def _store_result(self, key, future):
+        """Store a finished fetch; returns False if it failed"""
+        try:
+            result = future.result()
+        except CassetteMissingError:
+            raise
+        except Exception as e:
+            logger.warning(f"Could not refresh {self.name} {key}, keeping snapshot: {e}")
+            return False
+
+        names = self._names(key)
+        values = result if isinstance(key, tuple) else (result,)
+        for name, value in zip(names, values):
+            self.update(name, value)
+        return True
+
+    def _store_late_result(self, key, future):
+        if self._store_result(key, future):
+            self.save()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if payload.get('version') != SNAPSHOT_VERSION:
+            logger.info(f"Discarding {self.name} snapshot with version {payload.get('version')}")
+            return {}
+        return payload.get('resources', {})
+
+
+def snapshot_path(settings, name):
+    """Default location of an integration's snapshot file"""
+    return os.path.join(settings.get('CACHE_PATH', 'cache'), 'snapshots', f'{name}.json')
@@ -4,21 +4,82 @@ Fetches GitHub profile data and repositories
 """
 
 import os
-import requests
+import heapq
 import logging
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pelican import signals
 from pelican.generators import Generator
 
+from api_client import CassetteMissingError, HTTPCache, Snapshot, get_client, snapshot_path
+
+from .graphql import CANDIDATE_REPOS, USER_QUERY, profile_from_user, repositories_from_user
+
 logger = logging.getLogger(__name__)
 
+# GitHub data fetched once per build and shared by reference with every generator.
+# initialized is sent once per Pelican instance, so with --autoreload/--listen
+# regenerations reuse this data until the settings file changes
+_build_data = {}
+
+# Weights for ranking repositories: per star, for a push today (decaying
+# with age) and per topic
+DEFAULT_REPO_SCORE_WEIGHTS = {
+    'stars': 1.0,
+    'pushed_at': 10.0,
+    'topics': 0.5
+}
+
+# Seconds before a cached response must be revalidated, per endpoint
+DEFAULT_CACHE_TTLS = {
+    'profile': 3600,
+    'repos': 3600,
+    'repo': 6 * 3600,
+    'languages': 24 * 3600,
+    'releases': 6 * 3600,
+    'events': 900
+}
+
+# Repository fields filled from the per-repo detail requests
+REPOSITORY_DETAIL_KEYS = (
+    'languages', 'latest_release', 'license', 'homepage', 'has_issues', 'has_projects', 'has_wiki'
+)
+
+# Seconds before a snapshot resource is refreshed; profile stats go stale first
+DEFAULT_SNAPSHOT_TTLS = {
+    'profile': 3600,
+    'repositories': 6 * 3600,
+    'activity': 1800,
+    'contributions': 24 * 3600
+}
+
+def get_github_client(settings):
+    """Return the shared GitHub API client with its conditional-request cache"""
+    def create_cache():
+        cache_dir = settings.get('GITHUB_CACHE_PATH') or os.path.join(
+            settings.get('CACHE_PATH', 'cache'), 'github'
+        )
+        ttls = dict(DEFAULT_CACHE_TTLS)
+        ttls.update(settings.get('GITHUB_CACHE_TTLS', {}))
+        return HTTPCache(
+            cache_dir,
+            ttls=ttls,
+            max_bytes=settings.get('GITHUB_CACHE_MAX_BYTES', 5 * 1024 * 1024)
+        )
+    return get_client('GitHub', settings, cache_factory=create_cache)
+
 class GitHubDataGenerator(Generator):
     """Generator to fetch GitHub profile and repository data"""
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.github_data = {}
+        self.client = get_github_client(self.settings)
         
+    def _get(self, url, endpoint, headers, params=None):
+        """GET a GitHub API URL through the conditional-request cache"""
+        return self.client.get(url, params=params, headers=headers, endpoint=endpoint)
+    
     def generate_context(self):
         """Generate GitHub context data"""
         github_token = os.environ.get('GITHUB_TOKEN')
@@ -32,47 +93,102 @@ class GitHubDataGenerator(Generator):
         if github_token:
             headers['Authorization'] = f'token {github_token}'
         
-        try:
-            # Fetch user profile
-            profile = self._get_user_profile(github_username, headers)
-            
-            # Fetch repositories
-            repositories = self._get_repositories(github_username, headers, max_repos=8)
-            
-            # Fetch recent activity
-            activity = self._get_recent_activity(github_username, headers, max_events=10)
-            
-            # Fetch contribution stats
-            contributions = self._get_contribution_stats(github_username, headers)
-            
-            self.github_data = {
-                'profile': profile,
-                'repositories': repositories,
-                'activity': activity,
-                'contributions': contributions,
-                'last_updated': datetime.now().isoformat()
-            }
-            
-            logger.info(f"Successfully fetched GitHub data for user: {github_username}")
-            
-        except Exception as e:
-            logger.error(f"Error fetching GitHub data: {e}")
+        api_mode = self.settings.get('GITHUB_API_MODE', 'rest')
+        if api_mode == 'graphql' and not github_token and self.client.mode != 'replay':
+            logger.warning("GITHUB_API_MODE is 'graphql' but GITHUB_TOKEN is not set, using REST")
+            api_mode = 'rest'
+        
+        ttls = dict(DEFAULT_SNAPSHOT_TTLS)
+        ttls.update(self.settings.get('GITHUB_SNAPSHOT_TTLS', {}))
+        snapshot = Snapshot(
+            'GitHub',
+            snapshot_path(self.settings, f'github-{github_username}'),
+            ttls=ttls,
+            refresh_all=self.client.mode != 'live'
+        )
+        
+        fetchers = {
+            'activity': lambda: self._get_recent_activity(github_username, headers, max_events=10),
+            'contributions': lambda: self._get_contribution_stats(github_username, headers)
+        }
+        if api_mode == 'graphql':
+            # Fetch profile and repositories in one GraphQL query
+            fetchers[('profile', 'repositories')] = lambda: self._get_graphql_data(
+                github_username, headers, max_repos=8
+            )
+        else:
+            fetchers['profile'] = lambda: self._get_user_profile(github_username, headers)
+            fetchers['repositories'] = lambda: self._get_repositories(
+                github_username, headers, max_repos=8, previous_repositories=snapshot.get('repositories')
+            )
+        
+        # Render from the last good snapshot, refreshing stale resources within the budget
+        data = snapshot.refresh(fetchers, budget=self.settings.get('GITHUB_REFRESH_BUDGET', 30))
+        
+        if all(value is None for value in data.values()):
+            logger.error(f"No GitHub data available for user: {github_username}")
             self.github_data = self._get_fallback_data(github_username)
+            return
+        
+        # Only the resources that never loaded fall back to placeholders
+        fallback = self._get_fallback_data(github_username)
+        self.github_data = {
+            'profile': data['profile'] or fallback['profile'],
+            # Lets the template hide placeholder profile counts
+            'profile_fallback': data['profile'] is None,
+            'repositories': data['repositories'] or [],
+            'activity': data['activity'] or [],
+            'contributions': data['contributions'] or {},
+            'last_updated': datetime.now().isoformat()
+        }
+        
+        logger.info(f"GitHub data ready for user: {github_username}")
+    
+    def _get_graphql_data(self, username, headers, max_repos=8):
+        """Get profile and repositories from the GitHub GraphQL API"""
+        url = self.settings.get('GITHUB_GRAPHQL_URL', 'https://api.github.com/graphql')
+        payload = {
+            'query': USER_QUERY,
+            # Over-fetch recent repositories so filtering still leaves max_repos to rank
+            'variables': {'login': username, 'first': max_repos, 'candidates': CANDIDATE_REPOS}
+        }
+        
+        response = self.client.post(url, json=payload, headers=headers)
+        response.raise_for_status()
+        
+        data = response.json()
+        if data.get('errors'):
+            messages = '; '.join(error.get('message', '') for error in data['errors'])
+            raise ValueError(f"GraphQL query failed: {messages}")
+        
+        user = data['data']['user']
+        if not user:
+            raise ValueError(f"GitHub user not found: {username}")
+        
+        weights = self._score_weights()
+        now = datetime.now(timezone.utc)
+        repositories = repositories_from_user(
+            user,
+            max_repos,
+            skip_archived=self.settings.get('GITHUB_SKIP_ARCHIVED', True),
+            score=lambda repo: self._score_repository(repo, weights, now)
+        )
+        return profile_from_user(user), repositories
     
     def _get_user_profile(self, username, headers):
         """Get GitHub user profile"""
         url = f'https://api.github.com/users/{username}'
-        response = requests.get(url, headers=headers, timeout=10)
+        response = self._get(url, 'profile', headers)
         response.raise_for_status()
         
         data = response.json()
         return {
             'username': data['login'],
-            'name': data.get('name', ''),
-            'bio': data.get('bio', ''),
-            'location': data.get('location', ''),
-            'blog': data.get('blog', ''),
-            'twitter_username': data.get('twitter_username', ''),
+            'name': data.get('name') or '',
+            'bio': data.get('bio') or '',
+            'location': data.get('location') or '',
+            'blog': data.get('blog') or '',
+            'twitter_username': data.get('twitter_username') or '',
             'public_repos': data['public_repos'],
             'followers': data['followers'],
             'following': data['following'],
@@ -82,88 +198,147 @@ class GitHubDataGenerator(Generator):
             'updated_at': data['updated_at']
         }
     
-    def _get_repositories(self, username, headers, max_repos=8):
-        """Get user's public repositories"""
+    def _get_repositories(self, username, headers, max_repos=8, previous_repositories=None):
+        """Get the user's best public repositories across all pages
+
+        Repositories whose detail requests fail keep the details from
+        previous_repositories, the last snapshot, when it has them.
+        """
         url = f'https://api.github.com/users/{username}/repos'
         params = {
             'sort': 'updated',
             'direction': 'desc',
-            'per_page': max_repos,
+            'per_page': 100,
             'type': 'public'
         }
+        skip_archived = self.settings.get('GITHUB_SKIP_ARCHIVED', True)
+        weights = self._score_weights()
+        now = datetime.now(timezone.utc)
         
-        response = requests.get(url, headers=headers, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        repositories = []
-        
-        for repo in data:
+        # Bounded min-heap of the best repositories seen so far; the negated
+        # index makes earlier (more recently updated) repos win ties
+        top_repos = []
+        for index, repo in enumerate(self.client.paginate(url, params=params, headers=headers, endpoint='repos')):
             # Skip forks unless they have significant activity
             if repo['fork'] and repo['stargazers_count'] < 5:
                 continue
-                
-            repository = {
-                'name': repo['name'],
-                'full_name': repo['full_name'],
-                'description': repo.get('description', ''),
-                'html_url': repo['html_url'],
-                'clone_url': repo['clone_url'],
-                'language': repo.get('language', ''),
-                'stargazers_count': repo['stargazers_count'],
-                'watchers_count': repo['watchers_count'],
-                'forks_count': repo['forks_count'],
-                'open_issues_count': repo['open_issues_count'],
-                'size': repo['size'],
-                'default_branch': repo['default_branch'],
-                'topics': repo.get('topics', []),
-                'created_at': repo['created_at'],
-                'updated_at': repo['updated_at'],
-                'pushed_at': repo['pushed_at'],
-                'is_fork': repo['fork'],
-                'is_private': repo['private'],
-                'archived': repo.get('archived', False)
-            }
+            if skip_archived and repo.get('archived', False):
+                continue
             
-            # Get additional repository details
-            try:
-                repo_details = self._get_repository_details(repo['full_name'], headers)
-                repository.update(repo_details)
-            except Exception as e:
-                logger.warning(f"Could not fetch details for {repo['full_name']}: {e}")
+            entry = (self._score_repository(repo, weights, now), -index, repo)
+            if len(top_repos) < max_repos:
+                heapq.heappush(top_repos, entry)
+            else:
+                heapq.heappushpop(top_repos, entry)
+        
+        selected = [repo for _, _, repo in sorted(top_repos, reverse=True)]
+        previous = {repo['full_name']: repo for repo in previous_repositories or []}
+        
+        repositories = []
+        pending_details = []
+        max_workers = max(1, self.settings.get('GITHUB_MAX_WORKERS', 8))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for repo in selected:
+                repository = {
+                    'name': repo['name'],
+                    'full_name': repo['full_name'],
+                    'description': repo.get('description') or '',
+                    'html_url': repo['html_url'],
+                    'clone_url': repo['clone_url'],
+                    'language': repo.get('language') or '',
+                    'stargazers_count': repo['stargazers_count'],
+                    'watchers_count': repo['watchers_count'],
+                    'forks_count': repo['forks_count'],
+                    'open_issues_count': repo['open_issues_count'],
+                    'size': repo['size'],
+                    'default_branch': repo['default_branch'],
+                    'topics': repo.get('topics') or [],
+                    'created_at': repo['created_at'],
+                    'updated_at': repo['updated_at'],
+                    'pushed_at': repo['pushed_at'],
+                    'is_fork': repo['fork'],
+                    'is_private': repo['private'],
+                    'archived': repo.get('archived', False)
+                }
             
-            repositories.append(repository)
+                # Queue additional repository details on the worker pool
+                pending_details.append(self._submit_repository_details(executor, repo['full_name'], headers))
+                repositories.append(repository)
+        
+            # Collect details in ranked order
+            for repository, futures in zip(repositories, pending_details):
+                try:
+                    repository.update(self._get_repository_details(futures))
+                except CassetteMissingError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Could not fetch details for {repository['full_name']}: {e}")
+                    # Keep the last good details rather than overwriting them in the snapshot
+                    last_good = previous.get(repository['full_name'], {})
+                    repository.update({key: last_good[key] for key in REPOSITORY_DETAIL_KEYS if key in last_good})
             
         return repositories
     
-    def _get_repository_details(self, full_name, headers):
-        """Get additional repository details"""
+    def _score_weights(self):
+        """Repository score weights with GITHUB_REPO_SCORE_WEIGHTS applied"""
+        weights = dict(DEFAULT_REPO_SCORE_WEIGHTS)
+        weights.update(self.settings.get('GITHUB_REPO_SCORE_WEIGHTS', {}))
+        return weights
+    
+    def _score_repository(self, repo, weights, now):
+        """Rank a repository by stars, push recency and topics"""
+        score = repo['stargazers_count'] * weights['stars']
+        score += len(repo.get('topics') or []) * weights['topics']
+        
+        if repo.get('pushed_at'):
+            pushed_at = datetime.fromisoformat(repo['pushed_at'].replace('Z', '+00:00'))
+            age_days = max(0.0, (now - pushed_at).total_seconds() / 86400)
+            # Halves roughly every month without a push
+            score += weights['pushed_at'] / (1 + age_days / 30)
+        
+        return score
+    
+    def _submit_repository_details(self, executor, full_name, headers):
+        """Start the repo, languages and latest release requests concurrently"""
         url = f'https://api.github.com/repos/{full_name}'
-        response = requests.get(url, headers=headers, timeout=10)
+        return {
+            'repo': executor.submit(self._get, url, 'repo', headers),
+            'languages': executor.submit(self._get, f'{url}/languages', 'languages', headers),
+            'releases': executor.submit(self._get, f'{url}/releases/latest', 'releases', headers)
+        }
+    
+    def _get_repository_details(self, futures):
+        """Get additional repository details from submitted requests"""
+        response = futures['repo'].result()
         response.raise_for_status()
         
         data = response.json()
         
         # Get languages
-        languages_url = f'https://api.github.com/repos/{full_name}/languages'
-        languages_response = requests.get(languages_url, headers=headers, timeout=10)
         languages = {}
-        if languages_response.status_code == 200:
-            languages = languages_response.json()
+        try:
+            languages_response = futures['languages'].result()
+            if languages_response.status_code == 200:
+                languages = languages_response.json()
+        except CassetteMissingError:
+            raise
+        except Exception:
+            pass
         
         # Get latest release
-        releases_url = f'https://api.github.com/repos/{full_name}/releases/latest'
         latest_release = None
         try:
-            releases_response = requests.get(releases_url, headers=headers, timeout=10)
+            releases_response = futures['releases'].result()
             if releases_response.status_code == 200:
                 release_data = releases_response.json()
                 latest_release = {
-                    'name': release_data.get('name', ''),
+                    'name': release_data.get('name') or '',
                     'tag_name': release_data.get('tag_name', ''),
                     'published_at': release_data.get('published_at', ''),
                     'html_url': release_data.get('html_url', '')
                 }
+        except CassetteMissingError:
+            raise
         except:
             pass
         
@@ -171,7 +346,7 @@ class GitHubDataGenerator(Generator):
             'languages': languages,
             'latest_release': latest_release,
             'license': data.get('license', {}).get('name', '') if data.get('license') else '',
-            'homepage': data.get('homepage', ''),
+            'homepage': data.get('homepage') or '',
             'has_issues': data.get('has_issues', False),
             'has_projects': data.get('has_projects', False),
             'has_wiki': data.get('has_wiki', False)
@@ -182,43 +357,38 @@ class GitHubDataGenerator(Generator):
         url = f'https://api.github.com/users/{username}/events/public'
         params = {'per_page': max_events}
         
-        try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
-            response.raise_for_status()
+        response = self._get(url, 'events', headers, params=params)
+        response.raise_for_status()
+        
+        data = response.json()
+        activities = []
+        
+        for event in data:
+            activity = {
+                'type': event['type'],
+                'repo_name': event['repo']['name'],
+                'repo_url': f"https://github.com/{event['repo']['name']}",
+                'created_at': event['created_at'],
+                'public': event['public']
+            }
             
-            data = response.json()
-            activities = []
+            # Add type-specific details
+            if event['type'] == 'PushEvent':
+                commits = event['payload'].get('commits', [])
+                activity['commits_count'] = len(commits)
+                if commits:
+                    activity['commit_message'] = commits[0].get('message', '')
+            elif event['type'] == 'CreateEvent':
+                activity['ref_type'] = event['payload'].get('ref_type', '')
+            elif event['type'] == 'IssuesEvent':
+                activity['action'] = event['payload'].get('action', '')
+                issue = event['payload'].get('issue', {})
+                activity['issue_title'] = issue.get('title', '')
+                activity['issue_url'] = issue.get('html_url', '')
             
-            for event in data:
-                activity = {
-                    'type': event['type'],
-                    'repo_name': event['repo']['name'],
-                    'repo_url': f"https://github.com/{event['repo']['name']}",
-                    'created_at': event['created_at'],
-                    'public': event['public']
-                }
-                
-                # Add type-specific details
-                if event['type'] == 'PushEvent':
-                    commits = event['payload'].get('commits', [])
-                    activity['commits_count'] = len(commits)
-                    if commits:
-                        activity['commit_message'] = commits[0].get('message', '')
-                elif event['type'] == 'CreateEvent':
-                    activity['ref_type'] = event['payload'].get('ref_type', '')
-                elif event['type'] == 'IssuesEvent':
-                    activity['action'] = event['payload'].get('action', '')
-                    issue = event['payload'].get('issue', {})
-                    activity['issue_title'] = issue.get('title', '')
-                    activity['issue_url'] = issue.get('html_url', '')
-                
-                activities.append(activity)
-                
-            return activities
+            activities.append(activity)
             
-        except Exception as e:
-            logger.warning(f"Could not fetch recent activity: {e}")
-            return []
+        return activities
     
     def _get_contribution_stats(self, username, headers):
         """Get contribution statistics (simplified)"""
@@ -256,22 +426,28 @@ class GitHubDataGenerator(Generator):
             'activity': [],
             'contributions': {},
             'last_updated': datetime.now().isoformat(),
+            'profile_fallback': True,
             'fallback': True
         }
 
+def fetch_github_data(pelican):
+    """Fetch GitHub data once per build into the shared build data store"""
+    github_gen = GitHubDataGenerator(
+        {},
+        pelican.settings,
+        pelican.path,
+        pelican.theme,
+        pelican.output_path
+    )
+    github_gen.generate_context()
+    _build_data['github'] = github_gen.github_data
+
 def add_github_data(generator):
-    """Add GitHub data to the template context"""
-    if hasattr(generator, 'context'):
-        github_gen = GitHubDataGenerator(
-            generator.context,
-            generator.settings,
-            generator.path,
-            generator.theme,
-            generator.output_path
-        )
-        github_gen.generate_context()
-        generator.context['github'] = github_gen.github_data
+    """Add the already fetched GitHub data to the template context"""
+    if hasattr(generator, 'context') and 'github' in _build_data:
+        generator.context['github'] = _build_data['github']
 
 def register():
     """Register the plugin"""
+    signals.initialized.connect(fetch_github_data)
     signals.generator_init.connect(add_github_data)
\ No newline at end of file
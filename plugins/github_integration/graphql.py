@@ -0,0 +1,157 @@
+"""
+GraphQL backend for the GitHub integration plugin
+Fetches the profile, pinned and recent repositories with their languages,
+license and latest release in a single query, mapped to the REST data shape
+"""
+
+# Recent repositories fetched as ranking candidates; the GraphQL page size limit
+CANDIDATE_REPOS = 100
+
+USER_QUERY = """
+query($login: String!, $first: Int!, $candidates: Int!) {
+  user(login: $login) {
+    login
+    name
+    bio
+    location
+    websiteUrl
+    twitterUsername
+    avatarUrl
+    url
+    createdAt
+    updatedAt
+    followers { totalCount }
+    following { totalCount }
+    publicRepositories: repositories(privacy: PUBLIC, ownerAffiliations: OWNER) { totalCount }
+    pinnedItems(first: $first, types: REPOSITORY) {
+      nodes { ...RepositoryFields }
+    }
+    recentRepositories: repositories(first: $candidates, privacy: PUBLIC, ownerAffiliations: OWNER,
+                                     orderBy: {field: UPDATED_AT, direction: DESC}) {
+      nodes { ...RepositoryFields }
+    }
+  }
+}
+
+fragment RepositoryFields on Repository {
+  name
+  nameWithOwner
+  description
+  url
+  homepageUrl
+  primaryLanguage { name }
+  stargazerCount
+  forkCount
+  diskUsage
+  isFork
+  isPrivate
+  isArchived
+  hasIssuesEnabled
+  hasProjectsEnabled
+  hasWikiEnabled
+  createdAt
+  updatedAt
+  pushedAt
+  defaultBranchRef { name }
+  licenseInfo { name }
+  openIssues: issues(states: OPEN) { totalCount }
+  openPullRequests: pullRequests(states: OPEN) { totalCount }
+  repositoryTopics(first: 20) { nodes { topic { name } } }
+  languages(first: 20, orderBy: {field: SIZE, direction: DESC}) {
+    edges { size node { name } }
+  }
+  latestRelease { name tagName publishedAt url }
+}
+"""
+
+
+def profile_from_user(user):
+    """Map a GraphQL user node to the REST profile dict"""
+    return {
+        'username': user['login'],
+        'name': user.get('name') or '',
+        'bio': user.get('bio') or '',
+        'location': user.get('location') or '',
+        'blog': user.get('websiteUrl') or '',
+        'twitter_username': user.get('twitterUsername') or '',
+        'public_repos': user['publicRepositories']['totalCount'],
+        'followers': user['followers']['totalCount'],
+        'following': user['following']['totalCount'],
+        'avatar_url': user['avatarUrl'],
+        'html_url': user['url'],
+        'created_at': user['createdAt'],
+        'updated_at': user['updatedAt']
+    }
+
+
+def repository_from_node(node):
+    """Map a GraphQL repository node to the REST repository dict"""
+    release = node.get('latestRelease')
+    open_issues = node['openIssues']['totalCount'] + node['openPullRequests']['totalCount']
+
+    return {
+        'name': node['name'],
+        'full_name': node['nameWithOwner'],
+        'description': node.get('description') or '',
+        'html_url': node['url'],
+        'clone_url': f"{node['url']}.git",
+        'language': (node.get('primaryLanguage') or {}).get('name', ''),
+        'stargazers_count': node['stargazerCount'],
+        # REST reports stargazers as watchers_count
+        'watchers_count': node['stargazerCount'],
+        'forks_count': node['forkCount'],
+        'open_issues_count': open_issues,
+        'size': node.get('diskUsage') or 0,
+        'default_branch': (node.get('defaultBranchRef') or {}).get('name', ''),
+        'topics': [item['topic']['name'] for item in node['repositoryTopics']['nodes']],
+        'created_at': node['createdAt'],
+        'updated_at': node['updatedAt'],
+        'pushed_at': node['pushedAt'],
+        'is_fork': node['isFork'],
+        'is_private': node['isPrivate'],
+        'archived': node['isArchived'],
+        'languages': {edge['node']['name']: edge['size'] for edge in node['languages']['edges']},
+        'latest_release': {
+            'name': release.get('name') or '',
+            'tag_name': release.get('tagName', ''),
+            'published_at': release.get('publishedAt', ''),
+            'html_url': release.get('url', '')
+        } if release else None,
+        'license': (node.get('licenseInfo') or {}).get('name', ''),
+        'homepage': node.get('homepageUrl') or '',
+        'has_issues': node['hasIssuesEnabled'],
+        'has_projects': node['hasProjectsEnabled'],
+        'has_wiki': node['hasWikiEnabled']
+    }
+
+
+def repositories_from_user(user, max_repos, skip_archived=True, score=None):
+    """Pinned repositories first, then the best recent ones, without duplicates
+
+    Both lists get the REST backend's fork and archived filters, and recent
+    repositories are ranked by score before truncating to max_repos.
+    """
+    pinned = []
+    recent = []
+    seen = set()
+
+    for selected, nodes in ((pinned, user['pinnedItems']['nodes']), (recent, user['recentRepositories']['nodes'])):
+        for node in nodes:
+            # pinnedItems may contain empty nodes for gists filtered by type
+            if not node or node['nameWithOwner'] in seen:
+                continue
+            seen.add(node['nameWithOwner'])
+
+            # Skip forks unless they have significant activity
+            if node['isFork'] and node['stargazerCount'] < 5:
+                continue
+            if skip_archived and node['isArchived']:
+                continue
+
+            selected.append(repository_from_node(node))
+
+    if score is not None:
+        # Stable sort, so ties keep the most recently updated first
+        recent.sort(key=score, reverse=True)
+
+    return (pinned + recent)[:max_repos]
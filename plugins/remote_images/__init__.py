@@ -0,0 +1 @@
+from .images_plugin import register
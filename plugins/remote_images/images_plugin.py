@@ -0,0 +1,242 @@
+"""
+Remote Images Plugin for Pelican
+Mirrors the YouTube video thumbnails rendered by the theme into the output
+as right-sized, content-hashed variants
+"""
+
+import os
+import copy
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pelican import signals
+
+from api_client import get_client, get_record_mode
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Output directory for mirrored images, relative to OUTPUT_PATH
+REMOTE_IMAGES_DIR = 'theme/images/remote'
+
+EXTENSIONS = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/webp': 'webp',
+    'image/gif': 'gif'
+}
+
+
+class ImageMirror:
+    """Downloads, dedupes and re-encodes remote images with a disk cache"""
+
+    def __init__(self, settings, output_path):
+        self.cache_dir = os.path.join(settings.get('CACHE_PATH', 'cache'), 'remote_images')
+        self.output_dir = os.path.join(output_path, REMOTE_IMAGES_DIR)
+        if settings.get('RELATIVE_URLS'):
+            # Integration images are only rendered by index.html at the output root
+            self.url_prefix = REMOTE_IMAGES_DIR
+        else:
+            self.url_prefix = f"{settings.get('SITEURL', '')}/{REMOTE_IMAGES_DIR}"
+        self.widths = sorted(settings.get('REMOTE_IMAGES_WIDTHS', [160, 320, 480]))
+        self.quality = settings.get('REMOTE_IMAGES_QUALITY', 80)
+        self.max_age = settings.get('REMOTE_IMAGES_MAX_AGE', 7 * 24 * 3600)
+        self.max_workers = settings.get('REMOTE_IMAGES_MAX_WORKERS', 8)
+        self.stats = {'cached': 0, 'downloaded': 0, 'encoded': 0, 'failed': 0}
+
+        # Shared client for pooling, retries, rate limits and per-host stats
+        self.client = get_client('RemoteImages', settings)
+
+        self._lock = threading.Lock()
+        self.manifest = self._load_manifest()
+
+    def mirror(self, urls):
+        """Mirror URLs in parallel; returns {url: {'src': ..., 'srcset': ...}}
+
+        src is a JPEG (or the original format without Pillow) and srcset lists
+        only the WebP variants, so templates offer it as a <picture> source.
+        """
+        urls = sorted(set(url for url in urls if url and url.startswith(('http://', 'https://'))))
+        if not urls:
+            return {}
+
+        os.makedirs(os.path.join(self.cache_dir, 'files'), exist_ok=True)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = dict(zip(urls, executor.map(self._mirror_one, urls)))
+
+        self._save_manifest()
+        logger.info(
+            f"Remote images: {self.stats['cached']} cached, {self.stats['downloaded']} downloaded, "
+            f"{self.stats['encoded']} encoded, {self.stats['failed']} failed"
+        )
+        return {url: result for url, result in results.items() if result}
+
+    def _mirror_one(self, url):
+        try:
+            digest = self._fetch(url)
+            image = self._variants(digest)
+            for name in image['files']:
+                target = os.path.join(self.output_dir, name)
+                if not os.path.exists(target):
+                    shutil.copyfile(os.path.join(self.cache_dir, 'files', name), target)
+        except Exception as e:
+            logger.warning(f"Could not mirror {url}, keeping remote URL: {e}")
+            self._count('failed')
+            return None
+
+        return {
+            'src': f"{self.url_prefix}/{image['src']}",
+            'srcset': ', '.join(f'{self.url_prefix}/{name} {width}w' for name, width in image['srcset'])
+        }
+
+    def _fetch(self, url):
+        """Return the content hash for a URL, downloading only when needed"""
+        with self._lock:
+            entry = self.manifest['urls'].get(url)
+        if entry and time.time() - entry['fetched_at'] < self.max_age and entry['hash'] in self.manifest['images']:
+            self._count('cached')
+            return entry['hash']
+
+        response = self.client.get(url)
+        response.raise_for_status()
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()[:16]
+        content_type = response.headers.get('Content-Type', '').split(';')[0]
+        self._count('downloaded')
+
+        original = os.path.join(self.cache_dir, 'files', f"{digest}-source.{EXTENSIONS.get(content_type, 'img')}")
+        if not os.path.exists(original):
+            with open(original, 'wb') as f:
+                f.write(content)
+
+        with self._lock:
+            self.manifest['urls'][url] = {'hash': digest, 'source': original, 'fetched_at': time.time()}
+        return digest
+
+    def _variants(self, digest):
+        """Encode (once per content hash) the WebP/JPEG variants of an image"""
+        with self._lock:
+            image = self.manifest['images'].get(digest)
+            source = next(
+                entry['source'] for entry in self.manifest['urls'].values() if entry['hash'] == digest
+            )
+        files_dir = os.path.join(self.cache_dir, 'files')
+        if image and all(os.path.exists(os.path.join(files_dir, name)) for name in image['files']):
+            return image
+
+        if Image is None:
+            # Without Pillow the original bytes are mirrored as-is
+            name = f"{digest}.{source.rsplit('.', 1)[-1]}"
+            shutil.copyfile(source, os.path.join(files_dir, name))
+            image = {'src': name, 'srcset': [], 'files': [name]}
+        else:
+            image = self._encode(digest, source, files_dir)
+            self._count('encoded')
+
+        with self._lock:
+            self.manifest['images'][digest] = image
+        return image
+
+    def _encode(self, digest, source, files_dir):
+        with Image.open(source) as original:
+            original = original.convert('RGB')
+            widths = [width for width in self.widths if width < original.width] + [original.width]
+            widths = sorted(set(widths))[:len(self.widths)]
+
+            srcset = []
+            files = []
+            for width in widths:
+                height = round(original.height * width / original.width)
+                resized = original.resize((width, height), Image.LANCZOS)
+                name = f'{digest}-{width}.webp'
+                resized.save(os.path.join(files_dir, name), 'WEBP', quality=self.quality, method=6)
+                srcset.append((name, width))
+                files.append(name)
+
+            # JPEG fallback at the largest width for browsers without WebP
+            fallback = f'{digest}-{widths[-1]}.jpg'
+            resized.save(os.path.join(files_dir, fallback), 'JPEG', quality=self.quality,
+                         optimize=True, progressive=True)
+            files.append(fallback)
+
+        return {'src': fallback, 'srcset': srcset, 'files': files}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _load_manifest(self):
+        try:
+            with open(os.path.join(self.cache_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        manifest.setdefault('urls', {})
+        manifest.setdefault('images', {})
+        return manifest
+
+    def _save_manifest(self):
+        try:
+            with open(os.path.join(self.cache_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not save remote image manifest: {e}")
+
+
+def collect_image_fields(context):
+    """Find (container, key) pairs holding remote image URLs the templates render"""
+    youtube = context.get('youtube') or {}
+    # youtube-section.html renders only the video thumbnails
+    return [(video, 'thumbnail') for video in youtube.get('videos', [])]
+
+
+def mirror_remote_images(generators):
+    """Mirror integration images and rewrite their URLs before templates render"""
+    if not generators:
+        return
+    generator = generators[0]
+    settings = generator.settings
+    if not settings.get('REMOTE_IMAGES_ENABLED', True):
+        return
+    if get_record_mode(settings) != 'live':
+        # Images are not recorded in cassettes, so offline builds keep the remote URLs
+        logger.info("Remote images: not mirroring outside live API_RECORD_MODE")
+        return
+
+    # All generators share one context; work on copies so the plugins' build
+    # data and snapshots keep the original remote URLs
+    context = generator.context
+    for key in ('github', 'youtube'):
+        if context.get(key):
+            context[key] = copy.deepcopy(context[key])
+
+    fields = collect_image_fields(context)
+    if not fields:
+        return
+
+    mirror = ImageMirror(settings, generator.output_path)
+    mirrored = mirror.mirror(container[key] for container, key in fields)
+
+    for container, key in fields:
+        image = mirrored.get(container[key])
+        if image:
+            container[key] = image['src']
+            container[f'{key}_srcset'] = image['srcset']
+
+
+def register():
+    """Register the plugin"""
+    if Image is None:
+        logger.warning("Pillow is not installed; remote images are mirrored without resizing or WebP")
+    signals.all_generators_finalized.connect(mirror_remote_images)
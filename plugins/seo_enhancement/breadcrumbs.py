@@ -0,0 +1,104 @@
+"""
+Breadcrumbs for the SEO plugin
+Indexes every generated URL in a trie built from the site's URL patterns, so
+each content object's trail is one walk down its own path
+"""
+
+from .jsonld import dumps
+
+
+class URLTrie:
+    """Trie of URL path segments; nodes that are real pages carry a crumb"""
+
+    def __init__(self):
+        self.root = {'children': {}, 'crumb': None}
+
+    @staticmethod
+    def segments(url):
+        path = url.split('#', 1)[0].split('?', 1)[0]
+        if path.endswith('index.html'):
+            path = path[:-len('index.html')]
+        return [segment for segment in path.split('/') if segment]
+
+    def insert(self, url, name, link=None):
+        """Register url with a display name; link overrides where the crumb points"""
+        node = self.root
+        for segment in self.segments(url):
+            node = node['children'].setdefault(segment, {'children': {}, 'crumb': None})
+        node['crumb'] = {'name': name, 'url': url if link is None else link}
+
+    def crumbs(self, url):
+        """Crumbs from the home page down to url"""
+        node = self.root
+        trail = [node['crumb']] if node['crumb'] else []
+        for segment in self.segments(url):
+            node = node['children'].get(segment)
+            if node is None:
+                break
+            if node['crumb'] and node['crumb'] not in trail:
+                trail.append(node['crumb'])
+        return trail
+
+
+def archive_url(settings, name):
+    """URL of a period archive from its *_URL setting or, failing that, its *_SAVE_AS"""
+    pattern = settings.get(f'{name}_URL') or settings.get(f'{name}_SAVE_AS', '')
+    if pattern.endswith('index.html'):
+        pattern = pattern[:-len('index.html')]
+    return pattern
+
+
+def static_prefix(pattern):
+    """First path segment of a URL pattern if it has no placeholders"""
+    segments = URLTrie.segments(pattern or '')
+    if segments and '{' not in segments[0]:
+        return segments[0]
+    return None
+
+
+def build_index(settings, articles, pages, categories, tags):
+    """Build the URL trie for every content object in one pass"""
+    trie = URLTrie()
+    trie.insert('', 'Home')
+
+    # Sections such as blog/ have no page of their own; they point at the archives
+    archives = archive_url(settings, 'ARCHIVES')
+    for name in ('ARTICLE_URL', 'CATEGORY_URL', 'TAG_URL'):
+        prefix = static_prefix(settings.get(name))
+        if prefix:
+            trie.insert(f'{prefix}/', 'Blog', link=archives)
+
+    year_pattern = archive_url(settings, 'YEAR_ARCHIVE')
+    month_pattern = archive_url(settings, 'MONTH_ARCHIVE')
+    for article in articles:
+        if year_pattern:
+            trie.insert(year_pattern.format(date=article.date), article.date.strftime('%Y'))
+        if month_pattern:
+            trie.insert(month_pattern.format(date=article.date), article.date.strftime('%B'))
+        trie.insert(article.url, article.title)
+
+    for page in pages:
+        trie.insert(page.url, page.title)
+    for category in categories:
+        trie.insert(category.url, str(category))
+    for tag in tags:
+        trie.insert(tag.url, f'Tag: {tag}')
+
+    return trie
+
+
+def breadcrumb_json(crumbs, siteurl):
+    """Serialized BreadcrumbList for a trail"""
+    return dumps({
+        "@context": "https://schema.org",
+        "@type": "BreadcrumbList",
+        "itemListElement": [
+            {
+                "@type": "ListItem",
+                "position": position,
+                "name": crumb['name'],
+                "item": f"{siteurl}/{crumb['url']}"
+            }
+            for position, crumb in enumerate(crumbs, start=1)
+        ]
+    })
@@ -0,0 +1,77 @@
+"""
+Disk caches for the SEO plugin
+Small JSON files under CACHE_PATH/seo, loaded on first use and saved once
+when the build finishes
+"""
+
+import os
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class JSONFileCache:
+    """Key/value cache kept in memory and persisted as one JSON file
+
+    Only keys read or written during a build are saved, so entries for
+    edited or deleted content are dropped instead of piling up.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.previous = None
+        self.entries = {}
+
+    def get(self, key):
+        if key in self.entries:
+            return self.entries[key]
+        if self.previous is None:
+            self.previous = self._load()
+        value = self.previous.get(key)
+        if value is not None:
+            self.entries[key] = value
+        return value
+
+    def set(self, key, value):
+        self.entries[key] = value
+
+    def save(self):
+        if self.previous is None and not self.entries:
+            # Not used this build
+            return
+        entries, self.entries = self.entries, {}
+        previous, self.previous = self.previous, entries
+        if entries == previous:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save SEO cache {self.path}: {e}")
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+_caches = {}
+
+
+def get_cache(settings, name):
+    """Return the named cache, creating it on first use"""
+    if name not in _caches:
+        _caches[name] = JSONFileCache(os.path.join(settings.get('CACHE_PATH', 'cache'), 'seo', f'{name}.json'))
+    return _caches[name]
+
+
+def save_caches(pelican):
+    """Persist the entries every cache used during the build"""
+    for cache in _caches.values():
+        cache.save()
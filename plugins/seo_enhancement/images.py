@@ -0,0 +1,171 @@
+"""
+Featured image extraction for the SEO plugin
+Finds the first qualifying <img> in an article, resolves it against SITEURL
+and reads its dimensions from the image file header
+"""
+
+import os
+import re
+import struct
+import hashlib
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit, unquote
+
+from .cache import get_cache
+
+DEFAULT_IMAGE = '/theme/images/og-image.jpg'
+
+# Images smaller than this on either side (tracking pixels, icons) are skipped
+MIN_IMAGE_SIZE = 50
+
+# Cheap pre-check before tokenizing; tag names are case-insensitive
+IMG_TAG_RE = re.compile(r'<img\b', re.IGNORECASE)
+
+# Bump when extraction changes so cached results are recomputed
+EXTRACTION_VERSION = '2'
+
+
+class _FoundImage(Exception):
+    """Stops the tokenizer at the first qualifying image"""
+
+
+class FirstImageParser(HTMLParser):
+    """Streaming tokenizer that stops at the first qualifying <img>"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.src = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag != 'img':
+            return
+        attrs = dict(attrs)
+        src = (attrs.get('src') or '').strip()
+        if not src or src.startswith('data:'):
+            return
+        for dimension in ('width', 'height'):
+            value = attrs.get(dimension, '')
+            if value.isdigit() and int(value) < MIN_IMAGE_SIZE:
+                return
+        self.src = src
+        raise _FoundImage()
+
+    handle_startendtag = handle_starttag
+
+
+def find_first_image(html):
+    """Return the src of the first qualifying <img> in an HTML fragment"""
+    if not IMG_TAG_RE.search(html):
+        return None
+    parser = FirstImageParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except _FoundImage:
+        pass
+    return parser.src
+
+
+def image_size(path):
+    """Read (width, height) from a PNG, GIF, JPEG or WebP header, or None"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(32)
+            if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+                return struct.unpack('>II', head[16:24])
+            if head[:6] in (b'GIF87a', b'GIF89a'):
+                return struct.unpack('<HH', head[6:10])
+            if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+                return _webp_size(head)
+            if head[:2] == b'\xff\xd8':
+                f.seek(2)
+                return _jpeg_size(f)
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+def _webp_size(head):
+    chunk = head[12:16]
+    if chunk == b'VP8X':
+        width = int.from_bytes(head[24:27], 'little') + 1
+        height = int.from_bytes(head[27:30], 'little') + 1
+        return width, height
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', head[26:30])
+        return width & 0x3fff, height & 0x3fff
+    if chunk == b'VP8L':
+        bits = int.from_bytes(head[21:25], 'little')
+        return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+    return None
+
+
+def _jpeg_size(f):
+    """Walk JPEG segments up to the first start-of-frame marker"""
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xff:
+            return None
+        code = marker[1]
+        if code == 0xff:
+            f.seek(-1, os.SEEK_CUR)
+            continue
+        length = struct.unpack('>H', f.read(2))[0]
+        # SOF0-SOF15, excluding DHT (C4), JPG (C8) and DAC (CC)
+        if 0xc0 <= code <= 0xcf and code not in (0xc4, 0xc8, 0xcc):
+            height, width = struct.unpack('>xHH', f.read(5))
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def local_image_path(url, settings):
+    """Map a site image URL to the file it is built from, if any"""
+    siteurl = settings.get('SITEURL', '')
+    if siteurl and url.startswith(siteurl):
+        url = url[len(siteurl):]
+    parts = urlsplit(url)
+    if parts.netloc:
+        return None
+    relative = unquote(parts.path).lstrip('/')
+
+    candidates = [os.path.join(settings.get('PATH', 'content'), relative)]
+    theme_prefix = settings.get('THEME_STATIC_DIR', 'theme') + '/'
+    if relative.startswith(theme_prefix):
+        candidates.append(os.path.join(settings.get('THEME', 'theme'), 'static', relative[len(theme_prefix):]))
+    candidates.append(os.path.join(settings.get('OUTPUT_PATH', 'output'), relative))
+
+    return next((path for path in candidates if os.path.isfile(path)), None)
+
+
+def extract_featured_image(article):
+    """Return {'url', 'width', 'height'} for an article, memoized by content hash"""
+    settings = article.settings
+    siteurl = settings.get('SITEURL', '')
+    content = getattr(article, 'content', '') or ''
+    # 'image' is an explicit SEO image; the theme's 'featured_image' is site-root relative
+    explicit = getattr(article, 'image', '')
+    if not explicit and getattr(article, 'featured_image', ''):
+        explicit = '/' + article.featured_image.lstrip('/')
+
+    key = hashlib.sha256(
+        '\0'.join((EXTRACTION_VERSION, siteurl, article.url, str(explicit), content)).encode('utf-8')
+    ).hexdigest()
+    cache = get_cache(settings, 'images')
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    src = explicit or find_first_image(content) or DEFAULT_IMAGE
+    url = urljoin(f'{siteurl}/{article.url}', src)
+    if src == DEFAULT_IMAGE:
+        url = f'{siteurl}{DEFAULT_IMAGE}'
+
+    path = local_image_path(url, settings)
+    size = image_size(path) if path else None
+    image = {
+        'url': url,
+        'width': size[0] if size else None,
+        'height': size[1] if size else None
+    }
+    cache.set(key, image)
+    return image
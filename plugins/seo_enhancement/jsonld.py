@@ -0,0 +1,27 @@
+"""
+JSON-LD serialization for the SEO plugin
+Produces minified strings that are safe to embed in <script> tags, using
+orjson when it is installed
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bump when the shape of the generated JSON-LD changes to invalidate caches
+JSONLD_VERSION = 1
+
+# Characters Jinja's tojson also escapes, so a value can never close the <script>
+_SCRIPT_ESCAPES = {ord('<'): '\\u003c', ord('>'): '\\u003e', ord('&'): '\\u0026'}
+
+
+def dumps(data):
+    """Serialize data to a minified JSON string safe inside <script>"""
+    if orjson is not None:
+        text = orjson.dumps(data).decode('utf-8')
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return text.translate(_SCRIPT_ESCAPES)
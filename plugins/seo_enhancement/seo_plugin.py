@@ -4,112 +4,159 @@ Adds structured data, meta tags, and SEO improvements
 """
 
 import json
+import hashlib
 import logging
 from datetime import datetime
 from pelican import signals
 from pelican.contents import Article, Page
 
+from .breadcrumbs import breadcrumb_json, build_index
+from .cache import get_cache, save_caches
+from .images import extract_featured_image
+from .jsonld import JSONLD_VERSION, dumps
+
 logger = logging.getLogger(__name__)
 
-def add_structured_data(generator, metadata):
+# Website JSON-LD is identical for every generator, so it is built once per build
+_website_cache = {}
+
+def build_website_data(settings):
+    """Website JSON-LD dict and its serialized string, built once per settings"""
+    key = tuple(settings.get(name, '') for name in ('SITENAME', 'SITEDESCRIPTION', 'SITEURL', 'AUTHOR'))
+    if key not in _website_cache:
+        website_data = {
+            "@context": "https://schema.org",
+            "@type": "Website",
+            "name": settings.get('SITENAME', ''),
+            "description": settings.get('SITEDESCRIPTION', ''),
+            "url": settings.get('SITEURL', ''),
+            "author": {
+                "@type": "Person",
+                "name": settings.get('AUTHOR', ''),
+                "url": settings.get('SITEURL', '')
+            },
+            "publisher": {
+                "@type": "Person",
+                "name": settings.get('AUTHOR', '')
+            }
+        }
+        _website_cache[key] = (website_data, dumps(website_data))
+    return _website_cache[key]
+
+def add_structured_data(generator):
     """Add JSON-LD structured data to articles and pages"""
+    if not hasattr(generator, 'context'):
+        return
     
     # Website structured data (added to all pages)
-    website_data = {
+    website_data, website_json = build_website_data(generator.settings)
+    generator.context['structured_data'] = {
+        'website': website_data,
+        'website_json': website_json
+    }
+
+def article_cache_key(article, settings):
+    """Hash of the article source file plus the settings its JSON-LD depends on"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([
+        JSONLD_VERSION,
+        article.source_path,
+        [settings.get(name) for name in ('SITEURL', 'AUTHOR', 'ARTICLE_URL', 'SUMMARY_MAX_LENGTH', 'TIMEZONE')]
+    ]).encode('utf-8'))
+    try:
+        with open(article.source_path, 'rb') as f:
+            digest.update(f.read())
+    except (OSError, TypeError):
+        # No readable source (e.g. generated content): key on the rendered HTML
+        digest.update(article.content.encode('utf-8'))
+    return digest.hexdigest()
+
+def build_article_data(article, settings):
+    """Article JSON-LD dict"""
+    article_data = {
         "@context": "https://schema.org",
-        "@type": "Website",
-        "name": generator.settings.get('SITENAME', ''),
-        "description": generator.settings.get('SITEDESCRIPTION', ''),
-        "url": generator.settings.get('SITEURL', ''),
+        "@type": "BlogPosting",
+        "headline": article.title,
+        "description": getattr(article, 'summary', '') or article.title,
+        "image": get_article_image(article),
+        "datePublished": article.date.isoformat(),
+        "dateModified": getattr(article, 'modified', article.date).isoformat(),
         "author": {
             "@type": "Person",
-            "name": generator.settings.get('AUTHOR', ''),
-            "url": generator.settings.get('SITEURL', '')
+            "name": article.author.name if hasattr(article.author, 'name') else str(article.author)
         },
         "publisher": {
             "@type": "Person",
-            "name": generator.settings.get('AUTHOR', '')
+            "name": settings.get('AUTHOR', '')
+        },
+        "url": f"{settings.get('SITEURL', '')}/{article.url}",
+        "mainEntityOfPage": {
+            "@type": "WebPage",
+            "@id": f"{settings.get('SITEURL', '')}/{article.url}"
         }
     }
     
-    if not hasattr(generator, 'context'):
-        return
+    # Add categories as keywords
+    if hasattr(article, 'category') and article.category:
+        article_data['keywords'] = [str(article.category)]
         
-    generator.context['structured_data'] = {
-        'website': website_data
-    }
+    # Add tags as additional keywords
+    if hasattr(article, 'tags') and article.tags:
+        if 'keywords' in article_data:
+            article_data['keywords'].extend([str(tag) for tag in article.tags])
+        else:
+            article_data['keywords'] = [str(tag) for tag in article.tags]
+    
+    return article_data
 
 def add_article_structured_data(article_generator):
-    """Add structured data to articles"""
+    """Add serialized JSON-LD to articles, reusing cached strings for unchanged sources"""
+    settings = article_generator.settings
+    cache = get_cache(settings, 'jsonld')
+    
     for article in article_generator.articles:
         if hasattr(article, 'structured_data'):
+            # Structured data given in metadata is serialized as-is
+            article.structured_data_json = dumps(article.structured_data)
             continue
-            
-        # Article structured data
-        article_data = {
-            "@context": "https://schema.org",
-            "@type": "BlogPosting",
-            "headline": article.title,
-            "description": getattr(article, 'summary', '') or article.title,
-            "image": get_article_image(article),
-            "datePublished": article.date.isoformat(),
-            "dateModified": getattr(article, 'modified', article.date).isoformat(),
-            "author": {
-                "@type": "Person",
-                "name": article.author.name if hasattr(article.author, 'name') else str(article.author)
-            },
-            "publisher": {
-                "@type": "Person",
-                "name": article_generator.settings.get('AUTHOR', '')
-            },
-            "url": f"{article_generator.settings.get('SITEURL', '')}/{article.url}",
-            "mainEntityOfPage": {
-                "@type": "WebPage",
-                "@id": f"{article_generator.settings.get('SITEURL', '')}/{article.url}"
-            }
-        }
-        
-        # Add categories as keywords
-        if hasattr(article, 'category') and article.category:
-            article_data['keywords'] = [str(article.category)]
-            
-        # Add tags as additional keywords
-        if hasattr(article, 'tags') and article.tags:
-            if 'keywords' in article_data:
-                article_data['keywords'].extend([str(tag) for tag in article.tags])
-            else:
-                article_data['keywords'] = [str(tag) for tag in article.tags]
         
-        article.structured_data = article_data
+        key = article_cache_key(article, settings)
+        structured_data_json = cache.get(key)
+        if structured_data_json is None:
+            structured_data_json = dumps(build_article_data(article, settings))
+            cache.set(key, structured_data_json)
+        article.structured_data_json = structured_data_json
+
+def get_featured_image(article):
+    """Featured image of an article, extracted once and kept on the article"""
+    if not hasattr(article, 'seo_image'):
+        article.seo_image = extract_featured_image(article)
+    return article.seo_image
 
 def get_article_image(article):
-    """Get article featured image or fallback"""
-    # Check for featured image in metadata
-    if hasattr(article, 'image'):
-        return article.image
-    
-    # Check for image in content (simplified)
-    content = getattr(article, 'content', '')
-    if 'img src=' in content:
-        # This is a simplified approach - in practice, you might want to parse HTML
-        pass
-    
-    # Fallback to site default
-    return "/theme/images/og-image.jpg"
+    """Get article featured image URL or the site default"""
+    return get_featured_image(article)['url']
 
-def add_breadcrumb_data(generator):
-    """Add breadcrumb structured data"""
-    if not hasattr(generator, 'context'):
+def add_breadcrumb_data(generators):
+    """Precompute breadcrumbs and their JSON-LD for every content object"""
+    if not generators:
         return
     
-    # This will be used in templates to generate breadcrumb JSON-LD
-    breadcrumb_template = {
-        "@context": "https://schema.org",
-        "@type": "BreadcrumbList",
-        "itemListElement": []
-    }
+    articles, pages, categories, tags = [], [], [], []
+    for generator in generators:
+        articles.extend(getattr(generator, 'articles', []))
+        pages.extend(getattr(generator, 'pages', []))
+        categories.extend(category for category, _ in getattr(generator, 'categories', []))
+        generator_tags = getattr(generator, 'tags', {})
+        tags.extend(generator_tags.keys() if isinstance(generator_tags, dict) else (tag for tag, _ in generator_tags))
+    
+    settings = generators[0].settings
+    siteurl = settings.get('SITEURL', '')
+    trie = build_index(settings, articles, pages, categories, tags)
     
-    generator.context['breadcrumb_template'] = breadcrumb_template
+    for obj in articles + pages + categories + tags:
+        obj.breadcrumbs = trie.crumbs(obj.url)
+        obj.breadcrumb_json = breadcrumb_json(obj.breadcrumbs, siteurl)
 
 def enhance_meta_tags(article_generator):
     """Enhance meta tags for articles"""
@@ -133,6 +180,9 @@ def enhance_meta_tags(article_generator):
             
         if not hasattr(article, 'og_image'):
             article.og_image = get_article_image(article)
+            featured = get_featured_image(article)
+            article.og_image_width = featured['width']
+            article.og_image_height = featured['height']
         
         # Add Twitter Card tags
         if not hasattr(article, 'twitter_title'):
@@ -149,4 +199,5 @@ def register():
     signals.generator_init.connect(add_structured_data)
     signals.article_generator_finalized.connect(add_article_structured_data)
     signals.article_generator_finalized.connect(enhance_meta_tags)
-    signals.generator_init.connect(add_breadcrumb_data)
\ No newline at end of file
+    signals.all_generators_finalized.connect(add_breadcrumb_data)
+    signals.finalized.connect(save_caches)
\ No newline at end of file
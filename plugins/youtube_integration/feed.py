@@ -0,0 +1,57 @@
+"""
+Incremental parser for the public YouTube channel Atom feed
+The feed lists a channel's latest uploads and costs no Data API quota
+"""
+
+import xml.etree.ElementTree as ET
+
+NAMESPACES = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'yt': 'http://www.youtube.com/xml/schemas/2015',
+    'media': 'http://search.yahoo.com/mrss/'
+}
+
+ENTRY_TAG = f"{{{NAMESPACES['atom']}}}entry"
+
+
+def _text(element, path):
+    found = element.find(path, NAMESPACES)
+    return (found.text or '') if found is not None else ''
+
+
+def _attribute(element, path, name, default=''):
+    found = element.find(path, NAMESPACES)
+    return found.get(name, default) if found is not None else default
+
+
+def parse_entry(entry):
+    """Map an Atom <entry> element to a flat dict"""
+    return {
+        'id': _text(entry, 'yt:videoId'),
+        'title': _text(entry, 'atom:title'),
+        'published_at': _text(entry, 'atom:published'),
+        'updated_at': _text(entry, 'atom:updated'),
+        'description': _text(entry, 'media:group/media:description'),
+        'thumbnail': _attribute(entry, 'media:group/media:thumbnail', 'url'),
+        'view_count': int(_attribute(entry, 'media:group/media:community/media:statistics', 'views', 0)),
+        'like_count': int(_attribute(entry, 'media:group/media:community/media:starRating', 'count', 0))
+    }
+
+
+def parse_feed(chunks):
+    """Yield entries from an iterable of feed byte chunks as they arrive
+
+    Each entry element is cleared once parsed, so memory stays flat and
+    callers can stop reading as soon as they have enough entries.
+    """
+    parser = ET.XMLPullParser(events=('end',))
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if element.tag == ENTRY_TAG:
+                yield parse_entry(element)
+                element.clear()
+    parser.close()
+    for _, element in parser.read_events():
+        if element.tag == ENTRY_TAG:
+            yield parse_entry(element)
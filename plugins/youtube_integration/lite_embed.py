@@ -0,0 +1,70 @@
+"""
+Click-to-load YouTube embeds
+Replaces YouTube player iframes with a static thumbnail and play button;
+theme/static/js/main.js swaps the iframe back in when the facade is clicked
+"""
+
+import re
+from html import escape, unescape
+from urllib.parse import urlsplit
+
+IFRAME_RE = re.compile(r'<iframe\b([^>]*)>\s*</iframe>', re.IGNORECASE)
+ATTRIBUTE_RE = re.compile(r'([\w-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+EMBED_HOSTS = ('www.youtube.com', 'youtube.com', 'www.youtube-nocookie.com', 'youtube-nocookie.com')
+
+# Same markup as the lite_youtube macro in partials/lite-youtube.html
+FACADE_TEMPLATE = (
+    '<div class="lite-youtube" data-embed-url="{embed_url}" data-title="{title}">'
+    '<picture><img src="{thumbnail}" alt="{title}" loading="lazy" width="480" height="360"></picture>'
+    '<a class="lite-youtube-play" href="https://www.youtube.com/watch?v={video_id}" '
+    'aria-label="Play video: {title}"><i class="fas fa-play" aria-hidden="true"></i></a>'
+    '</div>'
+)
+
+
+def parse_embed(src):
+    """Return (video_id, embed_url) for a YouTube embed src, or None"""
+    parts = urlsplit(unescape(src))
+    if parts.netloc.lower() not in EMBED_HOSTS or not parts.path.startswith('/embed/'):
+        return None
+    video_id = parts.path[len('/embed/'):].strip('/')
+    if not video_id or '/' in video_id:
+        return None
+    embed_url = f'https://{parts.netloc}{parts.path}' + (f'?{parts.query}' if parts.query else '')
+    return video_id, embed_url
+
+
+def render_facade(video_id, embed_url, title='YouTube video'):
+    return FACADE_TEMPLATE.format(
+        video_id=escape(video_id),
+        embed_url=escape(embed_url),
+        title=escape(title),
+        thumbnail=f'https://i.ytimg.com/vi/{escape(video_id)}/hqdefault.jpg'
+    )
+
+
+def rewrite_iframes(html):
+    """Replace YouTube iframes in an HTML fragment with facades"""
+    if '<iframe' not in html.lower():
+        return html
+
+    def replace(match):
+        attributes = {
+            name.lower(): double if double is not None else single
+            for name, double, single in ATTRIBUTE_RE.findall(match.group(1))
+        }
+        embed = parse_embed(attributes.get('src', ''))
+        if embed is None:
+            return match.group(0)
+        return render_facade(*embed, title=unescape(attributes.get('title') or 'YouTube video'))
+
+    return IFRAME_RE.sub(replace, html)
+
+
+def rewrite_content(content):
+    """Rewrite YouTube iframes in an article or page at build time"""
+    if not content.settings.get('YOUTUBE_LITE_EMBEDS', True):
+        return
+    if getattr(content, '_content', None):
+        content._content = rewrite_iframes(content._content)
@@ -0,0 +1,119 @@
+"""
+YouTube Data API quota ledger
+Records the unit cost of every call in a persistent daily ledger that
+resets on the Pacific-time day boundary, like the API quota itself
+"""
+
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+
+import pytz
+
+logger = logging.getLogger(__name__)
+
+PACIFIC = pytz.timezone('America/Los_Angeles')
+
+# Units charged per call by the YouTube Data API v3
+QUOTA_COSTS = {
+    'channels': 1,
+    'playlistItems': 1,
+    'videos': 1,
+    'playlists': 1,
+    'search': 100
+}
+
+
+class QuotaExceeded(Exception):
+    """Raised instead of a required call that would dip into the quota reserve"""
+
+
+class QuotaLedger:
+    """Persistent record of quota units spent today"""
+
+    def __init__(self, path, daily_limit=10000, reserve=500, low_watermark=2000):
+        self.path = path
+        self.daily_limit = daily_limit
+        # Required calls stop at the reserve; optional calls stop at the low watermark
+        self.reserve = reserve
+        self.low_watermark = low_watermark
+        self._lock = threading.Lock()
+        self.day, self.used = self._load()
+        self.build_calls = {}
+        self.skipped = []
+
+    @staticmethod
+    def today():
+        return datetime.now(PACIFIC).date().isoformat()
+
+    @property
+    def remaining(self):
+        with self._lock:
+            self._roll_over()
+            return self.daily_limit - self.used
+
+    def allows(self, endpoint, optional=False):
+        """Whether the planner lets this call spend quota"""
+        cost = QUOTA_COSTS.get(endpoint, 1)
+        floor = self.low_watermark if optional else self.reserve
+        return self.remaining - cost >= floor
+
+    def charge(self, endpoint):
+        """Record a call that reached the API"""
+        cost = QUOTA_COSTS.get(endpoint, 1)
+        with self._lock:
+            self._roll_over()
+            self.used += cost
+            calls, units = self.build_calls.get(endpoint, (0, 0))
+            self.build_calls[endpoint] = (calls + 1, units + cost)
+        self.save()
+
+    def skip(self, description):
+        with self._lock:
+            self.skipped.append(description)
+
+    def log_summary(self):
+        """Log this build's quota use, then reset the per-build counters"""
+        with self._lock:
+            calls, self.build_calls = self.build_calls, {}
+            skipped, self.skipped = self.skipped, []
+        units = sum(cost for _, cost in calls.values())
+        breakdown = ', '.join(f'{endpoint} {count}x={cost}' for endpoint, (count, cost) in sorted(calls.items()))
+        logger.info(
+            f"YouTube quota: {units} units this build ({breakdown or 'no calls'}), "
+            f"{self.remaining}/{self.daily_limit} left for {self.day} (Pacific)"
+        )
+        if skipped:
+            logger.info(f"YouTube quota planner skipped: {', '.join(skipped)}")
+
+    def save(self):
+        # Concurrent fetchers charge at the same time, so writes are serialized
+        # and atomic; a torn file would reset the ledger to 0 on the next load
+        with self._lock:
+            payload = {'day': self.day, 'used': self.used}
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f'{self.path}.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Could not save YouTube quota ledger: {e}")
+
+    def _roll_over(self):
+        today = self.today()
+        if self.day != today:
+            self.day, self.used = today, 0
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return self.today(), 0
+
+        if payload.get('day') != self.today():
+            return self.today(), 0
+        return payload['day'], payload.get('used', 0)
@@ -4,20 +4,76 @@ Fetches latest videos from YouTube channel and makes them available in templates
 """
 
 import os
-import requests
+import json
 import logging
 from datetime import datetime, timedelta
 from pelican import signals
 from pelican.generators import Generator
 
+from api_client import CassetteMissingError, Snapshot, get_client, snapshot_path
+
+from .feed import parse_feed
+from .lite_embed import rewrite_content
+from .quota import QuotaExceeded, QuotaLedger
+
 logger = logging.getLogger(__name__)
 
+# YouTube data fetched once per build and shared by reference with every generator.
+# initialized is sent once per Pelican instance, so with --autoreload/--listen
+# regenerations reuse this data until the settings file changes
+_build_data = {}
+
+_quota_ledger = None
+
+def get_quota_ledger(settings):
+    """Return the persistent quota ledger, loading it on first use"""
+    global _quota_ledger
+    if _quota_ledger is None:
+        _quota_ledger = QuotaLedger(
+            os.path.join(settings.get('CACHE_PATH', 'cache'), 'youtube', 'quota.json'),
+            daily_limit=settings.get('YOUTUBE_DAILY_QUOTA', 10000),
+            reserve=settings.get('YOUTUBE_QUOTA_RESERVE', 500),
+            low_watermark=settings.get('YOUTUBE_QUOTA_LOW_WATERMARK', 2000)
+        )
+    return _quota_ledger
+
+# Maximum ids per videos.list call and items per playlistItems page
+VIDEOS_PER_REQUEST = 50
+
+# The channel Atom feed lists at most this many recent uploads
+FEED_MAX_ENTRIES = 15
+
+# channels.list calls the plugin used to make per build: id, stats, uploads playlist
+LEGACY_CHANNEL_CALLS = 3
+
+# Seconds before a snapshot resource is refreshed; channel stats go stale first
+DEFAULT_SNAPSHOT_TTLS = {
+    'channel': 3600,
+    'videos': 3 * 3600,
+    'playlists': 24 * 3600
+}
+
 class YouTubeDataGenerator(Generator):
     """Generator to fetch YouTube channel data"""
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.youtube_data = {}
+        self.client = get_client('YouTube', self.settings)
+        self.quota = get_quota_ledger(self.settings)
+    
+    def _api_get(self, url, params, optional=False):
+        """Call a Data API endpoint if the quota planner allows it"""
+        endpoint = url.rsplit('/', 1)[-1]
+        if not self.quota.allows(endpoint, optional=optional):
+            raise QuotaExceeded(
+                f"{endpoint} call skipped, only {self.quota.remaining} quota units left today"
+            )
+        
+        response = self.client.get(url, params=params)
+        if self.client.mode != 'replay':
+            self.quota.charge(endpoint)
+        return response
         
     def generate_context(self):
         """Generate YouTube context data"""
@@ -25,134 +81,272 @@ class YouTubeDataGenerator(Generator):
         channel_username = self.settings.get('YOUTUBE_CHANNEL_USERNAME', 'BryanHoward')
         channel_id = self.settings.get('YOUTUBE_CHANNEL_ID', '')
         
+        ttls = dict(DEFAULT_SNAPSHOT_TTLS)
+        ttls.update(self.settings.get('YOUTUBE_SNAPSHOT_TTLS', {}))
+        snapshot = Snapshot(
+            'YouTube',
+            snapshot_path(self.settings, f'youtube-{channel_username}'),
+            ttls=ttls,
+            refresh_all=self.client.mode != 'live'
+        )
+        resources = ('channel', 'videos', 'playlists')
+        
+        if not api_key and self.client.mode == 'replay':
+            # Cassettes are stored without the key, so any placeholder works
+            api_key = 'replay'
+        
         if not api_key:
             logger.warning("YOUTUBE_API_KEY not found in environment variables")
-            self.youtube_data = self._get_fallback_data()
-            return
-            
-        try:
-            # Get channel ID if not provided
-            if not channel_id and channel_username:
-                channel_id = self._get_channel_id(api_key, channel_username)
-                
-            if channel_id:
-                # Fetch channel statistics
-                channel_stats = self._get_channel_stats(api_key, channel_id)
-                
-                # Fetch latest videos
-                latest_videos = self._get_latest_videos(api_key, channel_id, max_results=6)
+        elif snapshot.needs_refresh(resources):
+            try:
+                # Channel id and uploads playlist never change, so they are cached on disk
+                channel_ids = self._load_channel_ids(channel_username, channel_id)
+                channel_stats = None
+                channel_calls = 0
                 
-                # Fetch playlists
-                playlists = self._get_playlists(api_key, channel_id, max_results=5)
+                need_stats = not snapshot.is_fresh('channel')
+                if channel_ids is None or need_stats:
+                    channel_ids, channel_stats = self._get_channel(
+                        api_key, channel_username, channel_id, channel_ids, with_stats=need_stats
+                    )
+                    channel_calls = 1
                 
-                self.youtube_data = {
-                    'channel': {
-                        'id': channel_id,
-                        'username': channel_username,
-                        'url': f'https://www.youtube.com/@{channel_username}',
-                        'stats': channel_stats
-                    },
-                    'videos': latest_videos,
-                    'playlists': playlists,
-                    'last_updated': datetime.now().isoformat()
-                }
-                
-                logger.info(f"Successfully fetched YouTube data for channel: {channel_username}")
+                logger.info(
+                    f"YouTube channel resolution used {channel_calls} channels.list call(s), "
+                    f"saving {LEGACY_CHANNEL_CALLS - channel_calls} quota units"
+                )
                 
-            else:
-                logger.error("Could not determine YouTube channel ID")
-                self.youtube_data = self._get_fallback_data()
-                
-        except Exception as e:
-            logger.error(f"Error fetching YouTube data: {e}")
+                if channel_ids:
+                    channel_id = channel_ids['channel_id']
+                    
+                    def get_channel():
+                        if channel_stats is None:
+                            raise ValueError("channels.list returned no statistics")
+                        return {
+                            'id': channel_id,
+                            'username': channel_username,
+                            'url': f'https://www.youtube.com/@{channel_username}',
+                            'stats': channel_stats
+                        }
+                    
+                    fetchers = {
+                        'channel': get_channel,
+                        'videos': lambda: self._get_videos(
+                            api_key,
+                            channel_ids,
+                            max_results=self.settings.get('YOUTUBE_MAX_VIDEOS', 6),
+                            previous_videos=snapshot.get('videos')
+                        ),
+                        'playlists': lambda: self._get_playlists(api_key, channel_id, max_results=5)
+                    }
+                    snapshot.refresh(fetchers, budget=self.settings.get('YOUTUBE_REFRESH_BUDGET', 30))
+                else:
+                    logger.error("Could not determine YouTube channel ID")
+                    
+            except CassetteMissingError:
+                raise
+            except Exception as e:
+                logger.error(f"Error fetching YouTube data: {e}")
+        
+        # Render from the last good snapshot
+        data = {resource: snapshot.get(resource) for resource in resources}
+        
+        if all(value is None for value in data.values()):
             self.youtube_data = self._get_fallback_data()
-    
-    def _get_channel_id(self, api_key, username):
-        """Get channel ID from username"""
-        url = 'https://www.googleapis.com/youtube/v3/channels'
-        params = {
-            'key': api_key,
-            'forUsername': username,
-            'part': 'id'
+            return
+        
+        # Only the resources that never loaded fall back to placeholders
+        fallback = self._get_fallback_data()
+        self.youtube_data = {
+            'channel': data['channel'] or fallback['channel'],
+            'videos': data['videos'] or [],
+            'playlists': data['playlists'] or [],
+            'last_updated': datetime.now().isoformat()
         }
         
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
+        logger.info(f"YouTube data ready for channel: {channel_username}")
+    
+    def _channel_ids_path(self):
+        return os.path.join(self.settings.get('CACHE_PATH', 'cache'), 'youtube', 'channels.json')
+    
+    def _load_channel_ids(self, username, channel_id):
+        """Get the cached channel id and uploads playlist id, if resolved before"""
+        # Record/replay builds always resolve so the request sequence is fixed
+        if self.client.mode != 'live':
+            return None
+        try:
+            with open(self._channel_ids_path(), 'r', encoding='utf-8') as f:
+                return json.load(f).get(channel_id or username)
+        except (OSError, ValueError):
+            return None
+    
+    def _save_channel_ids(self, key, channel_ids):
+        path = self._channel_ids_path()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
         
-        data = response.json()
-        if data.get('items'):
-            return data['items'][0]['id']
-        return None
+        cached[key] = channel_ids
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(cached, f, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not cache YouTube channel ids: {e}")
     
-    def _get_channel_stats(self, api_key, channel_id):
-        """Get channel statistics"""
+    def _get_channel(self, api_key, username, channel_id, channel_ids=None, with_stats=True):
+        """Resolve the channel and fetch its statistics with one channels.list call
+        
+        Returns the channel ids (channel id and uploads playlist id) and the
+        channel stats, or None for stats when with_stats is False.
+        """
+        parts = []
+        if channel_ids is None:
+            parts.extend(['id', 'contentDetails'])
+        if with_stats:
+            parts.extend(['statistics', 'snippet'])
+        
         url = 'https://www.googleapis.com/youtube/v3/channels'
         params = {
             'key': api_key,
-            'id': channel_id,
-            'part': 'statistics,snippet'
+            'part': ','.join(parts)
         }
+        if channel_ids:
+            params['id'] = channel_ids['channel_id']
+        elif channel_id:
+            params['id'] = channel_id
+        else:
+            params['forUsername'] = username
         
-        response = requests.get(url, params=params, timeout=10)
+        response = self._api_get(url, params)
         response.raise_for_status()
         
         data = response.json()
-        if data.get('items'):
-            item = data['items'][0]
-            stats = item['statistics']
-            snippet = item['snippet']
-            
-            return {
-                'subscriber_count': int(stats.get('subscriberCount', 0)),
-                'video_count': int(stats.get('videoCount', 0)),
-                'view_count': int(stats.get('viewCount', 0)),
-                'title': snippet.get('title', ''),
-                'description': snippet.get('description', ''),
-                'thumbnail': snippet.get('thumbnails', {}).get('medium', {}).get('url', '')
+        if not data.get('items'):
+            return channel_ids, None
+        item = data['items'][0]
+        
+        if channel_ids is None:
+            channel_ids = {
+                'channel_id': item['id'],
+                'uploads_playlist_id': item['contentDetails']['relatedPlaylists']['uploads']
             }
-        return {}
-    
-    def _get_latest_videos(self, api_key, channel_id, max_results=6):
-        """Get latest videos from channel"""
-        # First, get the uploads playlist ID
-        url = 'https://www.googleapis.com/youtube/v3/channels'
-        params = {
-            'key': api_key,
-            'id': channel_id,
-            'part': 'contentDetails'
+            self._save_channel_ids(channel_id or username, channel_ids)
+        
+        if not with_stats:
+            return channel_ids, None
+        
+        stats = item['statistics']
+        snippet = item['snippet']
+        return channel_ids, {
+            'subscriber_count': int(stats.get('subscriberCount', 0)),
+            'video_count': int(stats.get('videoCount', 0)),
+            'view_count': int(stats.get('viewCount', 0)),
+            'title': snippet.get('title', ''),
+            'description': snippet.get('description', ''),
+            'thumbnail': snippet.get('thumbnails', {}).get('medium', {}).get('url', '')
         }
+    
+    def _get_videos(self, api_key, channel_ids, max_results=6, previous_videos=None):
+        """Get latest videos from the configured source (Data API or channel feed)"""
+        source = self.settings.get('YOUTUBE_VIDEO_SOURCE', 'api')
+        if source == 'feed' and max_results <= FEED_MAX_ENTRIES:
+            return self._get_feed_videos(api_key, channel_ids['channel_id'], max_results, previous_videos)
+        if source == 'feed':
+            logger.info(f"YouTube feed lists only {FEED_MAX_ENTRIES} videos, using the Data API")
+        return self._get_latest_videos(
+            api_key, channel_ids['uploads_playlist_id'], max_results, previous_videos
+        )
+    
+    def _get_feed_videos(self, api_key, channel_id, max_results=6, previous_videos=None):
+        """Get latest videos from the zero-quota channel Atom feed
         
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
+        Only new or updated videos are sent to videos.list for durations and
+        stats; unchanged ones reuse their previous details with the feed's
+        fresh view and like counts.
+        """
+        url = self.settings.get('YOUTUBE_FEED_URL', 'https://www.youtube.com/feeds/videos.xml')
+        chunks = self.client.iter_content(url, params={'channel_id': channel_id})
         
-        data = response.json()
-        if not data.get('items'):
-            return []
+        entries = []
+        for entry in parse_feed(chunks):
+            entries.append(entry)
+            if len(entries) >= max_results:
+                # Closing the generator closes the response, so the rest is never read
+                chunks.close()
+                break
+        
+        previous = {video['id']: video for video in previous_videos or []}
+        changed_ids = [
+            entry['id'] for entry in entries
+            if entry['id'] not in previous or previous[entry['id']].get('updated_at') != entry['updated_at']
+        ]
+        video_details = self._get_video_details(api_key, changed_ids) if changed_ids else {}
+        logger.info(f"YouTube feed: {len(entries)} videos, {len(changed_ids)} new or changed")
+        
+        videos = []
+        for entry in entries:
+            video_id = entry['id']
+            details = video_details.get(video_id) or previous.get(video_id, {})
+            description = entry['description']
             
-        uploads_playlist_id = data['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+            videos.append({
+                'id': video_id,
+                'title': entry['title'],
+                'description': description[:200] + '...' if len(description) > 200 else description,
+                'url': f'https://www.youtube.com/watch?v={video_id}',
+                'embed_url': f'https://www.youtube.com/embed/{video_id}',
+                # Same medium-size thumbnail the Data API returns
+                'thumbnail': f'https://i.ytimg.com/vi/{video_id}/mqdefault.jpg',
+                'published_at': entry['published_at'],
+                'updated_at': entry['updated_at'],
+                'duration': details.get('duration', ''),
+                'view_count': entry['view_count'] or details.get('view_count', 0),
+                'like_count': entry['like_count'] or details.get('like_count', 0)
+            })
         
-        # Get videos from uploads playlist
+        return videos
+    
+    def _get_latest_videos(self, api_key, uploads_playlist_id, max_results=6, previous_videos=None):
+        """Get latest videos from the channel's uploads playlist"""
+        # Page through the uploads playlist until enough videos are collected
         url = 'https://www.googleapis.com/youtube/v3/playlistItems'
-        params = {
-            'key': api_key,
-            'playlistId': uploads_playlist_id,
-            'part': 'snippet',
-            'maxResults': max_results,
-            'order': 'date'
-        }
+        snippets = []
+        page_token = None
         
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
+        while len(snippets) < max_results:
+            params = {
+                'key': api_key,
+                'playlistId': uploads_playlist_id,
+                'part': 'snippet',
+                'maxResults': min(VIDEOS_PER_REQUEST, max_results - len(snippets))
+            }
+            if page_token:
+                params['pageToken'] = page_token
+            
+            response = self._api_get(url, params)
+            response.raise_for_status()
+            
+            data = response.json()
+            snippets.extend(item['snippet'] for item in data.get('items', []))
+            page_token = data.get('nextPageToken')
+            if not page_token:
+                break
         
-        data = response.json()
+        snippets = snippets[:max_results]
+        
+        # Get additional video details in batches and join them back by id
+        video_ids = [snippet['resourceId']['videoId'] for snippet in snippets]
+        video_details = self._get_video_details(api_key, video_ids)
+        previous = {video['id']: video for video in previous_videos or []}
         videos = []
         
-        for item in data.get('items', []):
-            snippet = item['snippet']
+        for snippet in snippets:
             video_id = snippet['resourceId']['videoId']
-            
-            # Get additional video details
-            video_details = self._get_video_details(api_key, video_id)
+            # Details skipped by the quota planner keep their last known values
+            details = video_details.get(video_id) or previous.get(video_id, {})
             
             video = {
                 'id': video_id,
@@ -162,45 +356,59 @@ class YouTubeDataGenerator(Generator):
                 'embed_url': f'https://www.youtube.com/embed/{video_id}',
                 'thumbnail': snippet['thumbnails'].get('medium', {}).get('url', ''),
                 'published_at': snippet['publishedAt'],
-                'duration': video_details.get('duration', ''),
-                'view_count': video_details.get('view_count', 0),
-                'like_count': video_details.get('like_count', 0)
+                'duration': details.get('duration', ''),
+                'view_count': details.get('view_count', 0),
+                'like_count': details.get('like_count', 0)
             }
             videos.append(video)
             
         return videos
     
-    def _get_video_details(self, api_key, video_id):
-        """Get additional video details"""
+    def _get_video_details(self, api_key, video_ids):
+        """Get additional video details, batching up to 50 ids per request"""
         url = 'https://www.googleapis.com/youtube/v3/videos'
-        params = {
-            'key': api_key,
-            'id': video_id,
-            'part': 'contentDetails,statistics'
-        }
+        details = {}
         
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+        for start in range(0, len(video_ids), VIDEOS_PER_REQUEST):
+            batch = video_ids[start:start + VIDEOS_PER_REQUEST]
+            params = {
+                'key': api_key,
+                'id': ','.join(batch),
+                'part': 'contentDetails,statistics'
+            }
             
-            data = response.json()
-            if data.get('items'):
-                item = data['items'][0]
-                content_details = item.get('contentDetails', {})
-                statistics = item.get('statistics', {})
-                
-                return {
-                    'duration': content_details.get('duration', ''),
-                    'view_count': int(statistics.get('viewCount', 0)),
-                    'like_count': int(statistics.get('likeCount', 0))
-                }
-        except Exception as e:
-            logger.warning(f"Could not fetch video details for {video_id}: {e}")
+            # Durations and like counts are optional when quota runs low
+            if not self.quota.allows('videos', optional=True):
+                self.quota.skip(f'details for {len(batch)} videos')
+                continue
             
-        return {}
+            try:
+                response = self._api_get(url, params, optional=True)
+                response.raise_for_status()
+                
+                for item in response.json().get('items', []):
+                    content_details = item.get('contentDetails', {})
+                    statistics = item.get('statistics', {})
+                    
+                    details[item['id']] = {
+                        'duration': content_details.get('duration', ''),
+                        'view_count': int(statistics.get('viewCount', 0)),
+                        'like_count': int(statistics.get('likeCount', 0))
+                    }
+            except CassetteMissingError:
+                raise
+            except Exception as e:
+                logger.warning(f"Could not fetch video details for {len(batch)} videos: {e}")
+        
+        return details
     
     def _get_playlists(self, api_key, channel_id, max_results=5):
         """Get channel playlists"""
+        # Playlists are optional; the snapshot keeps the last list when skipped
+        if not self.quota.allows('playlists', optional=True):
+            self.quota.skip('playlists')
+            raise QuotaExceeded("playlists skipped to save quota")
+        
         url = 'https://www.googleapis.com/youtube/v3/playlists'
         params = {
             'key': api_key,
@@ -209,33 +417,28 @@ class YouTubeDataGenerator(Generator):
             'maxResults': max_results
         }
         
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            playlists = []
+        response = self._api_get(url, params, optional=True)
+        response.raise_for_status()
+        
+        data = response.json()
+        playlists = []
+        
+        for item in data.get('items', []):
+            snippet = item['snippet']
+            content_details = item['contentDetails']
             
-            for item in data.get('items', []):
-                snippet = item['snippet']
-                content_details = item['contentDetails']
-                
-                playlist = {
-                    'id': item['id'],
-                    'title': snippet['title'],
-                    'description': snippet.get('description', '')[:150] + '...' if len(snippet.get('description', '')) > 150 else snippet.get('description', ''),
-                    'url': f'https://www.youtube.com/playlist?list={item["id"]}',
-                    'thumbnail': snippet['thumbnails'].get('medium', {}).get('url', ''),
-                    'video_count': content_details.get('itemCount', 0),
-                    'published_at': snippet['publishedAt']
-                }
-                playlists.append(playlist)
-                
-            return playlists
+            playlist = {
+                'id': item['id'],
+                'title': snippet['title'],
+                'description': snippet.get('description', '')[:150] + '...' if len(snippet.get('description', '')) > 150 else snippet.get('description', ''),
+                'url': f'https://www.youtube.com/playlist?list={item["id"]}',
+                'thumbnail': snippet['thumbnails'].get('medium', {}).get('url', ''),
+                'video_count': content_details.get('itemCount', 0),
+                'published_at': snippet['publishedAt']
+            }
+            playlists.append(playlist)
             
-        except Exception as e:
-            logger.warning(f"Could not fetch playlists: {e}")
-            return []
+        return playlists
     
     def _get_fallback_data(self):
         """Return fallback data when API is unavailable"""
@@ -263,19 +466,31 @@ def get_generators(generators):
     """Return the YouTube data generator"""
     return YouTubeDataGenerator
 
+def fetch_youtube_data(pelican):
+    """Fetch YouTube data once per build into the shared build data store"""
+    youtube_gen = YouTubeDataGenerator(
+        {},
+        pelican.settings,
+        pelican.path,
+        pelican.theme,
+        pelican.output_path
+    )
+    youtube_gen.generate_context()
+    _build_data['youtube'] = youtube_gen.youtube_data
+
 def add_youtube_data(generator):
-    """Add YouTube data to the template context"""
-    if hasattr(generator, 'context'):
-        youtube_gen = YouTubeDataGenerator(
-            generator.context,
-            generator.settings,
-            generator.path,
-            generator.theme,
-            generator.output_path
-        )
-        youtube_gen.generate_context()
-        generator.context['youtube'] = youtube_gen.youtube_data
+    """Add the already fetched YouTube data to the template context"""
+    if hasattr(generator, 'context') and 'youtube' in _build_data:
+        generator.context['youtube'] = _build_data['youtube']
+
+def report_quota(pelican):
+    """Log the per-build quota summary"""
+    if _quota_ledger is not None:
+        _quota_ledger.log_summary()
 
 def register():
     """Register the plugin"""
-    signals.generator_init.connect(add_youtube_data)
\ No newline at end of file
+    signals.initialized.connect(fetch_youtube_data)
+    signals.generator_init.connect(add_youtube_data)
+    signals.content_object_init.connect(rewrite_content)
+    signals.finalized.connect(report_quota)
\ No newline at end of file
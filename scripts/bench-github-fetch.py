@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark GitHub repository detail fetching against a local stub server
+Serves GitHub-shaped JSON from http.server with injected latency and times
+the repository fetch serially and with GITHUB_MAX_WORKERS threads
+Usage: python scripts/bench-github-fetch.py [--latency 100] [--repos 8] [--workers 8]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'plugins'))
+
+from pelican.settings import read_settings
+
+import api_client.client
+from github_integration.github_plugin import GitHubDataGenerator
+
+USERNAME = 'bench-user'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers the repository endpoints after sleeping for the injected latency"""
+
+    latency = 0.1
+    repo_count = 8
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        path = urlsplit(self.path).path
+        parts = path.strip('/').split('/')
+
+        if path == f'/users/{USERNAME}/repos':
+            self._send(200, [self._repo(index) for index in range(self.repo_count)])
+        elif parts[:2] == ['repos', USERNAME] and len(parts) == 3:
+            self._send(200, {'license': {'name': 'MIT License'}, 'homepage': '', 'has_issues': True})
+        elif parts[:2] == ['repos', USERNAME] and parts[3:] == ['languages']:
+            self._send(200, {'Python': 12345})
+        elif parts[:2] == ['repos', USERNAME] and parts[3:] == ['releases', 'latest']:
+            self._send(200, {'name': 'v1.0', 'tag_name': 'v1.0', 'published_at': '2025-01-01T00:00:00Z'})
+        else:
+            self._send(404, {'message': 'Not Found'})
+
+    def _repo(self, index):
+        name = f'repo-{index}'
+        return {
+            'name': name, 'full_name': f'{USERNAME}/{name}', 'description': '',
+            'html_url': f'https://github.com/{USERNAME}/{name}',
+            'clone_url': f'https://github.com/{USERNAME}/{name}.git', 'language': 'Python',
+            'stargazers_count': self.repo_count - index, 'watchers_count': 0, 'forks_count': 0,
+            'open_issues_count': 0, 'size': 1, 'default_branch': 'main', 'topics': [],
+            'created_at': '2020-01-01T00:00:00Z', 'updated_at': '2025-01-01T00:00:00Z',
+            'pushed_at': '2025-01-01T00:00:00Z', 'fork': False, 'private': False, 'archived': False
+        }
+
+    def _send(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubAdapter(HTTPAdapter):
+    """Sends api.github.com requests to the stub server instead"""
+
+    def __init__(self, stub_url, **kwargs):
+        super().__init__(**kwargs)
+        self.stub_url = stub_url
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = f"{self.stub_url}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+        return super().send(request, **kwargs)
+
+
+def fetch_repositories(stub_url, workers, repos, cache_path):
+    """Time one cold repository fetch with the given worker count"""
+    settings = read_settings(override={
+        'PATH': ROOT,
+        'THEME': os.path.join(ROOT, 'theme'),
+        'CACHE_PATH': cache_path,
+        'GITHUB_MAX_WORKERS': workers,
+        'API_CLIENT_POOL_SIZE': max(10, workers),
+        'API_CLIENT_RATES': {'api.github.com': 1000},
+        'API_RECORD_MODE': 'live'
+    })
+    # Start from a fresh client and an empty response cache every run
+    api_client.client._clients.clear()
+    shutil.rmtree(cache_path, ignore_errors=True)
+
+    generator = GitHubDataGenerator({}, settings, settings['PATH'], settings['THEME'], cache_path)
+    generator.client.session.mount('https://api.github.com', StubAdapter(stub_url, pool_maxsize=max(10, workers)))
+
+    started = time.perf_counter()
+    repositories = generator._get_repositories(USERNAME, {}, max_repos=repos)
+    elapsed = time.perf_counter() - started
+    if len(repositories) != repos or not all(repo['languages'] for repo in repositories):
+        raise RuntimeError("Stub server did not return every repository with its details")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serial vs concurrent GitHub detail requests")
+    parser.add_argument("--latency", type=float, default=100, help="Injected latency per request in ms (default: 100)")
+    parser.add_argument("--repos", type=int, default=8, help="Repositories listed on the homepage (default: 8)")
+    parser.add_argument("--workers", type=int, default=8, help="GITHUB_MAX_WORKERS for the concurrent run (default: 8)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per configuration, best is reported (default: 3)")
+    args = parser.parse_args()
+
+    os.environ.pop('API_RECORD_MODE', None)
+    # Pelican warns about feed and timezone settings the benchmark does not use
+    logging.getLogger('pelican').setLevel(logging.ERROR)
+    StubHandler.latency = args.latency / 1000
+    StubHandler.repo_count = args.repos
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stub_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    cache_path = tempfile.mkdtemp(prefix='bench-github-')
+    requests_made = 1 + 3 * args.repos
+    print(f"{args.repos} repositories, {requests_made} requests, {args.latency:.0f}ms injected latency")
+
+    try:
+        results = {}
+        for workers in (1, args.workers):
+            best = min(fetch_repositories(stub_url, workers, args.repos, cache_path) for _ in range(args.runs))
+            results[workers] = best
+            label = "serial" if workers == 1 else f"{workers} workers"
+            print(f"  {label:<12} {best * 1000:8.0f}ms")
+        print(f"Speedup: {results[1] / results[args.workers]:.1f}x")
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the SEO plugin's article JSON-LD on a synthetic corpus
+Compares building and serializing every article on each build (the old
+dict + tojson path) with the plugin's pre-serialized strings, cold and
+with the on-disk cache from a previous build
+Usage: python scripts/bench-seo-jsonld.py [--articles 10000]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'plugins'))
+
+from seo_enhancement import cache, jsonld
+from seo_enhancement.seo_plugin import add_article_structured_data, build_article_data
+
+
+def write_corpus(content_path, count):
+    """Write count small Markdown sources and return their paths"""
+    paths = []
+    for index in range(count):
+        path = os.path.join(content_path, f'post-{index:05d}.md')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"Title: Post {index}\nDate: 2024-01-01\n\nBody of post {index}. " + "Lorem ipsum. " * 40)
+        paths.append(path)
+    return paths
+
+
+def make_articles(paths, settings):
+    """Fresh article stand-ins, as Pelican creates them on every build"""
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    articles = []
+    for index, path in enumerate(paths):
+        slug = f'post-{index:05d}'
+        articles.append(SimpleNamespace(
+            settings=settings,
+            source_path=path,
+            title=f'Post {index}',
+            summary=f'<p>Summary of post {index}.</p>',
+            content=f'<p>Body of post {index}.</p><img src="/images/{slug}.png" width="800" height="600">',
+            url=f'blog/2024/01/{slug}/',
+            date=start + timedelta(hours=index),
+            author=SimpleNamespace(name='Bryan Howard'),
+            category='Projects',
+            tags=['python', f'tag-{index % 50}']
+        ))
+    return articles
+
+
+def run_plugin(paths, settings):
+    # Module caches are per process; clearing them reloads from disk like a new build
+    cache._caches.clear()
+    articles = make_articles(paths, settings)
+    started = time.perf_counter()
+    add_article_structured_data(SimpleNamespace(settings=settings, articles=articles))
+    cache.save_caches(None)
+    return time.perf_counter() - started
+
+
+def run_baseline(paths, settings):
+    cache._caches.clear()
+    articles = make_articles(paths, settings)
+    started = time.perf_counter()
+    for article in articles:
+        json.dumps(build_article_data(article, settings))
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pre-serialized, cached article JSON-LD")
+    parser.add_argument("--articles", type=int, default=10000, help="Synthetic articles (default: 10000)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per configuration, best is reported (default: 3)")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench-seo-')
+    content_path = os.path.join(work_dir, 'content')
+    cache_path = os.path.join(work_dir, 'cache')
+    os.makedirs(content_path)
+    settings = {
+        'SITEURL': 'https://example.com',
+        'AUTHOR': 'Bryan Howard',
+        'TIMEZONE': 'America/Toronto',
+        'PATH': content_path,
+        'OUTPUT_PATH': os.path.join(work_dir, 'output'),
+        'THEME': os.path.join(ROOT, 'theme'),
+        'CACHE_PATH': cache_path
+    }
+
+    try:
+        paths = write_corpus(content_path, args.articles)
+        encoder = 'orjson' if jsonld.orjson is not None else 'json'
+        print(f"{args.articles} articles, {encoder} encoder")
+
+        baseline = min(run_baseline(paths, settings) for _ in range(args.runs))
+        cold = []
+        for _ in range(args.runs):
+            shutil.rmtree(cache_path, ignore_errors=True)
+            cold.append(run_plugin(paths, settings))
+        cold = min(cold)
+        warm = min(run_plugin(paths, settings) for _ in range(args.runs))
+
+        size = os.path.getsize(os.path.join(cache_path, 'seo', 'jsonld.json'))
+        print(f"  {'build + json.dumps':<22} {baseline * 1000:8.0f}ms")
+        print(f"  {'plugin, cold cache':<22} {cold * 1000:8.0f}ms")
+        print(f"  {'plugin, warm cache':<22} {warm * 1000:8.0f}ms  ({size / 1024:.0f} KiB jsonld.json)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Benchmark API-only vs feed-first YouTube video listing against a local stand-in
+Serves the channel Atom feed and the playlistItems/videos Data API endpoints
+from http.server with injected latency, then times each video source and
+counts the quota units it spends
+Usage: python scripts/bench-youtube-feed.py [--latency 100] [--videos 6]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from xml.sax.saxutils import escape
+
+from requests.adapters import HTTPAdapter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'plugins'))
+
+from pelican.settings import read_settings
+
+import api_client.client
+from youtube_integration import youtube_plugin
+
+CHANNEL_ID = 'UCbench000000000000000'
+UPLOADS_PLAYLIST_ID = 'UUbench000000000000000'
+
+# The channel feed always lists this many uploads
+FEED_ENTRIES = 15
+
+
+def video_id(index):
+    return f'bench{index:06d}'
+
+
+def feed_xml():
+    entries = ''.join(
+        f"""
+ <entry>
+  <id>yt:video:{video_id(index)}</id>
+  <yt:videoId>{video_id(index)}</yt:videoId>
+  <yt:channelId>{CHANNEL_ID}</yt:channelId>
+  <title>{escape(f'Video {index}')}</title>
+  <published>2025-01-{index + 1:02d}T12:00:00+00:00</published>
+  <updated>2025-01-{index + 1:02d}T12:00:00+00:00</updated>
+  <media:group>
+   <media:thumbnail url="https://i1.ytimg.com/vi/{video_id(index)}/hqdefault.jpg" width="480" height="360"/>
+   <media:description>{'Description text. ' * 20}</media:description>
+   <media:community>
+    <media:starRating count="{index}" average="5.00" min="1" max="5"/>
+    <media:statistics views="{index * 100}"/>
+   </media:community>
+  </media:group>
+ </entry>"""
+        for index in range(FEED_ENTRIES)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" '
+        'xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">\n'
+        f' <yt:channelId>{CHANNEL_ID}</yt:channelId>\n <title>Bench</title>{entries}\n</feed>\n'
+    ).encode('utf-8')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Stand-in for the channel feed and the Data API, after the injected latency"""
+
+    latency = 0.1
+    feed = feed_xml()
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+
+        if parts.path == '/feeds/videos.xml':
+            self._send(200, self.feed, 'application/atom+xml')
+        elif parts.path == '/youtube/v3/playlistItems':
+            count = int(query.get('maxResults', ['5'])[0])
+            self._send_json({'items': [
+                {'snippet': {
+                    'resourceId': {'videoId': video_id(index)}, 'title': f'Video {index}',
+                    'description': 'Description text. ' * 20, 'thumbnails': {'medium': {'url': ''}},
+                    'publishedAt': f'2025-01-{index + 1:02d}T12:00:00Z'
+                }}
+                for index in range(count)
+            ]})
+        elif parts.path == '/youtube/v3/videos':
+            ids = query.get('id', [''])[0].split(',')
+            self._send_json({'items': [
+                {'id': id_, 'contentDetails': {'duration': 'PT10M'},
+                 'statistics': {'viewCount': '100', 'likeCount': '10'}}
+                for id_ in ids
+            ]})
+        else:
+            self._send_json({'error': 'not found'}, status=404)
+
+    def _send_json(self, data, status=200):
+        self._send(status, json.dumps(data).encode('utf-8'), 'application/json')
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubAdapter(HTTPAdapter):
+    """Sends www.googleapis.com requests to the stand-in server instead"""
+
+    def __init__(self, stub_url, **kwargs):
+        super().__init__(**kwargs)
+        self.stub_url = stub_url
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = f"{self.stub_url}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+        return super().send(request, **kwargs)
+
+
+def list_videos(stub_url, source, max_videos, cache_path, previous_videos=None):
+    """Time one video listing and return (seconds, quota units, videos)"""
+    settings = read_settings(override={
+        'PATH': ROOT,
+        'THEME': os.path.join(ROOT, 'theme'),
+        'CACHE_PATH': cache_path,
+        'YOUTUBE_VIDEO_SOURCE': source,
+        'YOUTUBE_FEED_URL': f'{stub_url}/feeds/videos.xml',
+        'API_CLIENT_RATES': {'www.googleapis.com': 1000, '127.0.0.1': 1000},
+        'API_RECORD_MODE': 'live'
+    })
+    # Fresh client and quota ledger every run
+    api_client.client._clients.clear()
+    youtube_plugin._quota_ledger = None
+    shutil.rmtree(cache_path, ignore_errors=True)
+
+    generator = youtube_plugin.YouTubeDataGenerator({}, settings, settings['PATH'], settings['THEME'], cache_path)
+    generator.client.session.mount('https://www.googleapis.com', StubAdapter(stub_url))
+    channel_ids = {'channel_id': CHANNEL_ID, 'uploads_playlist_id': UPLOADS_PLAYLIST_ID}
+
+    started = time.perf_counter()
+    videos = generator._get_videos('bench-key', channel_ids, max_results=max_videos,
+                                   previous_videos=previous_videos)
+    elapsed = time.perf_counter() - started
+
+    units = sum(cost for _, cost in generator.quota.build_calls.values())
+    if len(videos) != max_videos or not all(video['duration'] for video in videos):
+        raise RuntimeError(f"{source} source did not return {max_videos} videos with details")
+    return elapsed, units, videos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API-only vs feed-first YouTube video listing")
+    parser.add_argument("--latency", type=float, default=100, help="Injected latency per request in ms (default: 100)")
+    parser.add_argument("--videos", type=int, default=6, help="YOUTUBE_MAX_VIDEOS, at most 15 (default: 6)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per configuration, best is reported (default: 3)")
+    args = parser.parse_args()
+    if not 1 <= args.videos <= FEED_ENTRIES:
+        parser.error(f"--videos must be between 1 and {FEED_ENTRIES}")
+
+    os.environ.pop('API_RECORD_MODE', None)
+    # Pelican warns about feed and timezone settings the benchmark does not use
+    logging.getLogger('pelican').setLevel(logging.ERROR)
+    StubHandler.latency = args.latency / 1000
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stub_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    cache_path = tempfile.mkdtemp(prefix='bench-youtube-')
+    print(f"{args.videos} videos, {args.latency:.0f}ms injected latency")
+
+    try:
+        _, _, snapshot = list_videos(stub_url, 'feed', args.videos, cache_path)
+        configurations = (
+            ("api", 'api', None),
+            ("feed, cold", 'feed', None),
+            ("feed, unchanged", 'feed', snapshot)
+        )
+        for label, source, previous in configurations:
+            runs = [list_videos(stub_url, source, args.videos, cache_path, previous) for _ in range(args.runs)]
+            best = min(elapsed for elapsed, _, _ in runs)
+            units = runs[0][1]
+            print(f"  {label:<16} {best * 1000:8.0f}ms  {units} quota units")
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
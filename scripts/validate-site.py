@@ -7,28 +7,483 @@ Performs comprehensive testing of generated site
 import os
 import sys
 import json
+import math
+import gzip
+import pstats
+import cProfile
+import fnmatch
+import hashlib
+import argparse
+import posixpath
 import requests
+import xml.etree.ElementTree as ET
+from collections import deque, namedtuple
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlparse, unquote
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
 from bs4 import BeautifulSoup
 import time
 
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# HTML files handed to a worker process per task
+HTML_BATCH_SIZE = 32
+
+# Production SITEURL from publishconf.py; absolute links to it are checked as internal
+SITE_URL = "https://bryan-howard.ca"
+
+# Attributes holding a single URL, and srcset-style attributes holding several
+URL_ATTRIBUTES = {'href', 'src', 'poster', 'action'}
+SRCSET_ATTRIBUTES = {'srcset'}
+
+# Bump when a per-file check changes so cached verdicts are discarded
+MANIFEST_VERSION = 2
+
+# One problem reported by a check; path is relative to the output directory when known
+Finding = namedtuple('Finding', ['check', 'path', 'severity', 'message'])
+
+def file_hash(path):
+    """Content hash of an output file"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ReferenceCollector(HTMLParser):
+    """Collects element ids and URL references from one page"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.ids = set()
+        self.references = []
+    
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if not value:
+                continue
+            if name == 'id' or (tag == 'a' and name == 'name'):
+                self.ids.add(value)
+            elif name in URL_ATTRIBUTES:
+                self.references.append(value.strip())
+            elif name in SRCSET_ATTRIBUTES:
+                self.references.extend(
+                    candidate.strip().split()[0] for candidate in value.split(',') if candidate.strip()
+                )
+
+def collect_references_batch(batch):
+    """Collect (rel_path, ids, references) for a batch of pages in a worker process"""
+    results = []
+    for html_file, rel_path in batch:
+        collector = ReferenceCollector()
+        with open(html_file, 'r', encoding='utf-8', errors='replace') as f:
+            collector.feed(f.read())
+        collector.close()
+        results.append((rel_path, collector.ids, collector.references))
+    return results
+
+def resolve_reference(page, reference, internal_hosts):
+    """Map a reference on a page to (output path, fragment), or None if external"""
+    parsed = urlparse(reference)
+    if parsed.scheme or parsed.netloc:
+        if parsed.scheme not in ('http', 'https', '') or parsed.netloc.lower() not in internal_hosts:
+            return None
+        path = parsed.path.lstrip('/')
+    elif parsed.path.startswith('/'):
+        path = parsed.path.lstrip('/')
+    elif parsed.path:
+        path = posixpath.join(posixpath.dirname(page), parsed.path)
+    else:
+        # Fragment-only link to the page itself
+        return page, parsed.fragment
+    
+    trailing_slash = path.endswith('/')
+    path = posixpath.normpath(unquote(path))
+    if path == '.':
+        path = ''
+    elif trailing_slash:
+        path += '/'
+    return path, parsed.fragment
+
+class ResourceCollector(HTMLParser):
+    """Collects the resources a page loads and whether they block rendering"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.in_head = False
+        self.resources = []
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'head':
+            self.in_head = True
+        elif tag == 'body':
+            self.in_head = False
+        elif tag == 'link' and 'stylesheet' in (attrs.get('rel') or '').lower().split() and attrs.get('href'):
+            blocking = self.in_head and attrs.get('media', 'all') not in ('print',) and 'disabled' not in attrs
+            self.resources.append(('stylesheet', attrs['href'], blocking))
+        elif tag == 'script' and attrs.get('src'):
+            blocking = self.in_head and not any(name in attrs for name in ('async', 'defer')) \
+                and attrs.get('type') != 'module'
+            self.resources.append(('script', attrs['src'], blocking))
+        elif tag in ('img', 'iframe', 'video', 'audio', 'source') and attrs.get('src'):
+            self.resources.append((tag, attrs['src'], False))
+    
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.in_head = False
+
+def collect_resources_batch(batch):
+    """Collect (rel_path, page bytes, resources) for a batch of pages in a worker process"""
+    results = []
+    for html_file, rel_path in batch:
+        with open(html_file, 'rb') as f:
+            content = f.read()
+        collector = ResourceCollector()
+        collector.feed(content.decode('utf-8', errors='replace'))
+        collector.close()
+        results.append((rel_path, len(content), len(gzip.compress(content, compresslevel=6)), collector.resources))
+    return results
+
+def load_budget(path):
+    """Read a page weight budget file: {"default": {...}, "pages": {"glob": {...}}}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        budget = json.load(f)
+    budget.setdefault('default', {})
+    budget.setdefault('pages', {})
+    return budget
+
+def page_budget(budget, rel_path):
+    """Limits for a page: the default budget overridden by every matching page glob"""
+    limits = dict(budget['default'])
+    for pattern, overrides in budget['pages'].items():
+        if fnmatch.fnmatch(rel_path, pattern):
+            limits.update(overrides)
+    return limits
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+# Elements every feed and entry must carry
+ATOM_FEED_REQUIRED = ('id', 'title', 'updated')
+ATOM_ENTRY_REQUIRED = ('id', 'title', 'updated')
+RSS_CHANNEL_REQUIRED = ('title', 'link', 'description')
+RSS_ITEM_REQUIRED = ('title', 'link')
+
+def parse_feed_date(value, rss=False):
+    """Parse an RFC 822 (RSS) or RFC 3339 (Atom) date; raises ValueError if invalid"""
+    if rss:
+        parsed = parsedate_to_datetime(value)
+        if parsed is None:
+            raise ValueError(value)
+        return parsed
+    return datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+
+def stream_feed(feed_file):
+    """Yield ('feed', kind, child tags) and ('entry', element) events from a feed
+    
+    Entries are detached from the tree once handled, so memory stays flat
+    however many entries the feed has.
+    """
+    stack = []
+    kind = None
+    feed_children = set()
+    for event, element in ET.iterparse(feed_file, events=('start', 'end')):
+        if event == 'start':
+            if kind is None:
+                kind = 'atom' if element.tag == f'{ATOM}feed' else 'rss' if element.tag == 'rss' else 'unknown'
+                yield ('root', kind, element.tag)
+            stack.append(element)
+            continue
+        
+        stack.pop()
+        tag = element.tag.replace(ATOM, '')
+        is_entry = (kind == 'atom' and tag == 'entry') or (kind == 'rss' and tag == 'item')
+        feed_level = len(stack) == (1 if kind == 'atom' else 2)
+        if is_entry:
+            yield ('entry', element)
+            element.clear()
+            if stack:
+                stack[-1].remove(element)
+        elif feed_level:
+            feed_children.add(tag)
+    yield ('feed', kind, feed_children)
+
+class OutputIndex:
+    """Every file and directory under the output directory, from one scandir walk"""
+    
+    def __init__(self, root):
+        self.root = Path(root)
+        # Relative POSIX path -> (size, mtime, is_dir)
+        self.entries = {}
+        self._walk()
+    
+    def _walk(self):
+        stack = [('', str(self.root))]
+        while stack:
+            rel_dir, directory = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            self.entries[rel_path] = (0, 0, True)
+                            stack.append((rel_path, entry.path))
+                        else:
+                            stat = entry.stat()
+                            self.entries[rel_path] = (stat.st_size, stat.st_mtime, False)
+            except OSError:
+                continue
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def exists(self, rel_path):
+        return rel_path in self.entries
+    
+    def is_dir(self, rel_path):
+        entry = self.entries.get(rel_path)
+        return bool(entry and entry[2])
+    
+    def size(self, rel_path):
+        entry = self.entries.get(rel_path)
+        return entry[0] if entry and not entry[2] else None
+    
+    def path(self, rel_path):
+        return self.root / rel_path
+    
+    def files(self, pattern=None, suffix=None):
+        """Relative paths of files, optionally filtered by glob pattern or suffix"""
+        return [
+            rel_path for rel_path, (_, _, is_dir) in self.entries.items()
+            if not is_dir
+            and (suffix is None or rel_path.endswith(suffix))
+            and (pattern is None or fnmatch.fnmatchcase(rel_path, pattern))
+        ]
+    
+    def url_paths(self):
+        """Every file path plus the directory URLs served by an index.html"""
+        paths = set(self.files())
+        for rel_path in self.files(suffix='index.html'):
+            if rel_path == 'index.html':
+                paths.add('')
+            elif rel_path.endswith('/index.html'):
+                paths.add(rel_path[:-len('index.html')])
+        return paths
+
+class ValidationManifest:
+    """Per-file verdicts keyed by content hash, reused across runs"""
+    
+    def __init__(self, path, full=False):
+        self.path = Path(path)
+        self.previous = {} if full else self._load()
+        self.files = {}
+        self.reused = 0
+    
+    def lookup(self, rel_path, digest):
+        """Cached (errors, warnings) for an unchanged file, or None"""
+        entry = self.previous.get(rel_path)
+        if entry and entry['hash'] == digest:
+            self.files[rel_path] = entry
+            self.reused += 1
+            return entry['errors'], entry['warnings']
+        return None
+    
+    def record(self, rel_path, digest, errors, warnings):
+        self.files[rel_path] = {'hash': digest, 'errors': errors, 'warnings': warnings}
+    
+    def save(self):
+        """Write the manifest; files not seen this run (deleted) are dropped"""
+        payload = {'version': MANIFEST_VERSION, 'parser': HTML_PARSER, 'files': self.files}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠ Could not save validation manifest: {e}")
+    
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Verdicts from another check version or parser backend are not comparable
+        if payload.get('version') != MANIFEST_VERSION or payload.get('parser') != HTML_PARSER:
+            return {}
+        return payload.get('files', {})
+
+def check_html_page(html_file):
+    """Check one HTML page; returns (errors, warnings) for the page"""
+    errors = []
+    warnings = []
+    
+    # Bytes let the parser detect the encoding from the document itself
+    with open(html_file, 'rb') as f:
+        soup = BeautifulSoup(f.read(), HTML_PARSER)
+    
+    # Check basic HTML structure
+    if not soup.find('title'):
+        errors.append("Missing <title> tag")
+    
+    if not soup.find('meta', attrs={'name': 'description'}):
+        warnings.append("Missing meta description")
+    
+    # Check for structured data
+    if not soup.find('script', attrs={'type': 'application/ld+json'}):
+        warnings.append("Missing structured data")
+    
+    # Check for Open Graph tags
+    if not soup.find('meta', property=lambda x: x and x.startswith('og:')):
+        warnings.append("Missing Open Graph tags")
+    
+    return errors, warnings
+
+def check_html_batch(batch):
+    """Check a batch of (html_file, rel_path) pairs in a worker process"""
+    results = []
+    for html_file, rel_path in batch:
+        try:
+            errors, warnings = check_html_page(html_file)
+        except Exception as e:
+            errors, warnings = [f"Error validating page: {e}"], []
+        results.append((rel_path, errors, warnings))
+    return results
+
+def check_page_layout(soup, structure=True, accessibility=True):
+    """Header/footer/navigation and accessibility checks for one page; returns (errors, warnings)
+
+    The live site, accessibility and crawl validators all report through
+    this so every page is held to the same checks and messages.
+    """
+    errors = []
+    warnings = []
+    
+    if structure:
+        if not soup.find('header', class_='site-header'):
+            errors.append("Site header not found")
+        if not soup.find('main', class_='site-main'):
+            errors.append("Main content area not found")
+        if not soup.find('footer', class_='site-footer'):
+            errors.append("Site footer not found")
+        if not soup.find(class_='mobile-menu-toggle'):
+            warnings.append("Mobile navigation not found")
+        if not soup.find(class_='theme-toggle'):
+            warnings.append("Theme toggle not found")
+    
+    if accessibility:
+        if not soup.find('nav'):
+            warnings.append("Missing semantic <nav> element")
+        if not soup.find('a', href='#main-content'):
+            warnings.append("Missing skip to main content link")
+        # No count in the message, so the crawl can group pages by finding
+        if any(not img.get('alt') for img in soup.find_all('img')):
+            warnings.append("Images without alt attributes")
+    
+    return errors, warnings
+
+def url_pattern(url):
+    """Group a URL path into a pattern such as /blog/{n}/{n}/{slug}/"""
+    path = urlparse(url).path
+    segments = [segment for segment in path.split('/') if segment]
+    pattern = []
+    for position, segment in enumerate(segments):
+        if segment.isdigit():
+            pattern.append('{n}')
+        elif segment == 'index.html' or (position == 0 and len(segments) > 1):
+            pattern.append(segment)
+        else:
+            pattern.append('{slug}')
+    return '/' + '/'.join(pattern) + ('/' if path.endswith('/') and pattern else '')
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
 class SiteValidator:
-    def __init__(self, base_url="http://localhost:8000", output_dir="output"):
+    def __init__(self, base_url="http://localhost:8000", output_dir="output", jobs=None,
+                 manifest_path="cache/validation-manifest.json", full=False, site_url=SITE_URL,
+                 crawl=False, concurrency=8, max_pages=1000,
+                 budget_path="scripts/page-budget.json", weight_report="cache/page-weight.json",
+                 profile_dir=None):
         self.base_url = base_url
+        self.budget_path = budget_path
+        self.weight_report = weight_report
+        self.site_url = site_url
+        self.crawl = crawl
+        self.concurrency = concurrency
+        self.max_pages = max_pages
+        self._homepage = None
+        self._index = None
         self.output_dir = Path(output_dir)
-        self.errors = []
-        self.warnings = []
+        self.jobs = jobs or os.cpu_count() or 1
+        self.manifest = ValidationManifest(manifest_path, full=full)
+        self.profile_dir = profile_dir
+        self.findings = []
+        self.checks = {}
+        self.current_check = None
+        self.files_checked = 0
+        self.timings = {}
         
-    def log_error(self, message):
+    @property
+    def index(self):
+        """Output index built on first use and shared by every check"""
+        if self._index is None:
+            start = time.perf_counter()
+            self._index = OutputIndex(self.output_dir)
+            self.timings['index'] = (len(self._index), time.perf_counter() - start)
+        return self._index
+    
+    def _html_files(self):
+        """(absolute path, relative path) of every HTML page in the output"""
+        return [(str(self.index.path(rel_path)), rel_path) for rel_path in sorted(self.index.files(suffix='.html'))]
+    
+    def _map_batches(self, func, files):
+        """Run func over batches of files in the process pool, yielding batch results"""
+        batches = [files[i:i + HTML_BATCH_SIZE] for i in range(0, len(files), HTML_BATCH_SIZE)]
+        if self.jobs == 1 or len(batches) <= 1:
+            for batch in batches:
+                yield func(batch)
+        else:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                # Yield each batch as soon as it finishes
+                futures = [executor.submit(func, batch) for batch in batches]
+                for future in as_completed(futures):
+                    yield future.result()
+    
+    @property
+    def errors(self):
+        return [self._describe(finding) for finding in self.findings if finding.severity == 'error']
+    
+    @property
+    def warnings(self):
+        return [self._describe(finding) for finding in self.findings if finding.severity == 'warning']
+    
+    @staticmethod
+    def _describe(finding):
+        return f"{finding.path}: {finding.message}" if finding.path else finding.message
+    
+    def log_error(self, message, path=None):
         """Log an error"""
-        self.errors.append(message)
-        print(f"✗ ERROR: {message}")
+        finding = Finding(self.current_check, path, 'error', message)
+        self.findings.append(finding)
+        print(f"✗ ERROR: {self._describe(finding)}")
         
-    def log_warning(self, message):
+    def log_warning(self, message, path=None):
         """Log a warning"""
-        self.warnings.append(message)
-        print(f"⚠ WARNING: {message}")
+        finding = Finding(self.current_check, path, 'warning', message)
+        self.findings.append(finding)
+        print(f"⚠ WARNING: {self._describe(finding)}")
         
     def log_success(self, message):
         """Log a success"""
@@ -51,104 +506,244 @@ class SiteValidator:
         ]
         
         for file_path in required_files:
-            full_path = self.output_dir / file_path
-            if full_path.exists():
+            if self.index.exists(file_path):
                 self.log_success(f"Found {file_path}")
             else:
-                self.log_error(f"Missing required file: {file_path}")
+                self.log_error("Missing required file", path=file_path)
         
         # Check theme directories
         theme_dirs = ["css", "js", "images"]
+        self.files_checked = len(required_files) + len(theme_dirs)
         for dir_name in theme_dirs:
-            dir_path = self.output_dir / "theme" / dir_name
-            if dir_path.exists():
+            if self.index.is_dir(f"theme/{dir_name}"):
                 self.log_success(f"Found theme/{dir_name}/ directory")
             else:
-                self.log_error(f"Missing theme directory: theme/{dir_name}/")
+                self.log_error("Missing theme directory", path=f"theme/{dir_name}/")
     
     def validate_html_pages(self):
-        """Validate HTML pages for basic structure and SEO"""
-        print("\n🔍 Validating HTML pages...")
+        """Validate every changed HTML page for basic structure and SEO"""
+        print(f"\n🔍 Validating HTML pages ({HTML_PARSER} parser, {self.jobs} jobs)...")
+        start = time.perf_counter()
         
-        html_files = list(self.output_dir.glob("**/*.html"))
+        html_files = self._html_files()
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            hashes = dict(zip(
+                (rel_path for _, rel_path in html_files),
+                executor.map(file_hash, (html_file for html_file, _ in html_files))
+            ))
         
-        for html_file in html_files[:10]:  # Limit to first 10 for performance
-            rel_path = html_file.relative_to(self.output_dir)
-            
-            try:
-                with open(html_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    soup = BeautifulSoup(content, 'html.parser')
-                
-                # Check basic HTML structure
-                if not soup.find('title'):
-                    self.log_error(f"{rel_path}: Missing <title> tag")
-                
-                if not soup.find('meta', attrs={'name': 'description'}):
-                    self.log_warning(f"{rel_path}: Missing meta description")
-                
-                # Check for structured data
-                structured_data = soup.find('script', attrs={'type': 'application/ld+json'})
-                if structured_data:
-                    self.log_success(f"{rel_path}: Has structured data")
-                else:
-                    self.log_warning(f"{rel_path}: Missing structured data")
+        # Unchanged pages reuse the verdict from the previous run
+        cached_results = []
+        changed = []
+        for html_file, rel_path in html_files:
+            cached = self.manifest.lookup(rel_path, hashes[rel_path])
+            if cached is None:
+                changed.append((html_file, rel_path))
+            else:
+                cached_results.append((rel_path, *cached))
+        pages_with_errors = self._report_html_results([cached_results])
+        pages_with_errors += self._report_html_results(self._map_batches(check_html_batch, changed), hashes)
+        
+        self.manifest.save()
+        elapsed = time.perf_counter() - start
+        self.files_checked = len(html_files)
+        self.log_success(
+            f"Validated {len(html_files)} HTML pages in {elapsed:.2f}s "
+            f"({len(changed)} checked, {self.manifest.reused} unchanged; "
+            f"{len(html_files) - pages_with_errors} without errors)"
+        )
+    
+    def _report_html_results(self, batch_results, hashes=None):
+        """Log findings from checked HTML batches; returns pages with errors"""
+        pages_with_errors = 0
+        for results in batch_results:
+            for rel_path, errors, warnings in results:
+                if hashes is not None:
+                    self.manifest.record(rel_path, hashes[rel_path], errors, warnings)
+                for error in errors:
+                    self.log_error(error, path=rel_path)
+                for warning in warnings:
+                    self.log_warning(warning, path=rel_path)
+                if errors:
+                    pages_with_errors += 1
+        return pages_with_errors
+    
+    def validate_links(self):
+        """Check that every internal href/src target and #fragment exists"""
+        print("\n🔗 Validating internal links and assets...")
+        
+        # Every output path, plus directory URLs served by their index.html
+        output_paths = self.index.url_paths()
+        html_files = self._html_files()
+        pages = [page for batch in self._map_batches(collect_references_batch, html_files) for page in batch]
+        
+        page_ids = {rel_path: ids for rel_path, ids, _ in pages}
+        internal_hosts = self._internal_hosts()
+        
+        # Group by target so a missing asset is reported once, not once per page
+        missing_targets = {}
+        missing_fragments = {}
+        reference_count = 0
+        for rel_path, _, references in pages:
+            for reference in references:
+                resolved = resolve_reference(rel_path, reference, internal_hosts)
+                if resolved is None:
+                    continue
+                reference_count += 1
+                target, fragment = resolved
                 
-                # Check for Open Graph tags
-                og_tags = soup.find_all('meta', property=lambda x: x and x.startswith('og:'))
-                if og_tags:
-                    self.log_success(f"{rel_path}: Has Open Graph tags")
+                if target in output_paths:
+                    page = f"{target}index.html" if target == '' or target.endswith('/') else target
+                elif f"{target}/index.html" in output_paths:
+                    page = f"{target}/index.html"
                 else:
-                    self.log_warning(f"{rel_path}: Missing Open Graph tags")
-                
-                self.log_success(f"Validated {rel_path}")
+                    missing_targets.setdefault(target, set()).add(rel_path)
+                    continue
                 
-            except Exception as e:
-                self.log_error(f"Error validating {rel_path}: {e}")
+                if fragment and fragment != 'top':
+                    ids = page_ids.get(page)
+                    if ids is not None and fragment not in ids:
+                        missing_fragments.setdefault(f"{target}#{fragment}", set()).add(rel_path)
+        
+        for target, sources in sorted(missing_targets.items()):
+            self.log_error(f"Broken link target (referenced from {self._describe_sources(sources)})", path=target)
+        for target, sources in sorted(missing_fragments.items()):
+            self.log_warning(f"Missing anchor (referenced from {self._describe_sources(sources)})", path=target)
+        
+        self.files_checked = len(html_files)
+        if not missing_targets and not missing_fragments:
+            self.log_success(f"All {reference_count} internal references in {len(html_files)} pages resolve")
+    
+    @staticmethod
+    def _describe_sources(sources, limit=3):
+        sources = sorted(sources)
+        described = ', '.join(sources[:limit])
+        if len(sources) > limit:
+            described += f" and {len(sources) - limit} more"
+        return described
     
     def validate_css_js_files(self):
         """Validate CSS and JavaScript files"""
         print("\n🎨 Validating CSS and JavaScript files...")
+        css_files = sorted(self.index.files(pattern="theme/css/*.css"))
+        js_files = sorted(self.index.files(pattern="theme/js/*.js"))
+        self.files_checked = len(css_files) + len(js_files)
         
         # Check CSS files
-        css_files = list(self.output_dir.glob("theme/css/*.css"))
         for css_file in css_files:
-            if css_file.stat().st_size == 0:
-                self.log_error(f"Empty CSS file: {css_file.name}")
+            name = posixpath.basename(css_file)
+            if self.index.size(css_file) == 0:
+                self.log_error("Empty CSS file", path=css_file)
             else:
-                self.log_success(f"CSS file has content: {css_file.name}")
+                self.log_success(f"CSS file has content: {name}")
         
         # Check JavaScript files
-        js_files = list(self.output_dir.glob("theme/js/*.js"))
         for js_file in js_files:
-            if js_file.stat().st_size == 0:
-                self.log_error(f"Empty JS file: {js_file.name}")
+            name = posixpath.basename(js_file)
+            if self.index.size(js_file) == 0:
+                self.log_error("Empty JS file", path=js_file)
             else:
-                self.log_success(f"JS file has content: {js_file.name}")
+                self.log_success(f"JS file has content: {name}")
     
     def validate_feeds(self):
-        """Validate RSS/Atom feeds"""
+        """Stream-validate every RSS/Atom feed, category feeds included"""
         print("\n📡 Validating feeds...")
         
-        feed_files = [
+        required_feeds = [
             "feeds/all.atom.xml",
             "feeds/all.rss.xml"
         ]
+        for feed_path in required_feeds:
+            if not self.index.exists(feed_path):
+                self.log_warning("Feed not found", path=feed_path)
+        
+        feed_files = sorted(self.index.files(pattern="feeds/*.xml"))
+        self.files_checked = len(feed_files)
+        
+        output_paths = self.index.url_paths()
+        internal_hosts = self._internal_hosts()
         
         for feed_path in feed_files:
-            feed_file = self.output_dir / feed_path
-            if feed_file.exists():
-                try:
-                    with open(feed_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if '<feed' in content or '<rss' in content:
-                            self.log_success(f"Valid feed: {feed_path}")
-                        else:
-                            self.log_error(f"Invalid feed format: {feed_path}")
-                except Exception as e:
-                    self.log_error(f"Error reading feed {feed_path}: {e}")
+            try:
+                entries = self._check_feed(feed_path, output_paths, internal_hosts)
+            except ET.ParseError as e:
+                self.log_error(f"Feed is not well-formed XML: {e}", path=feed_path)
+            except Exception as e:
+                self.log_error(f"Error reading feed: {e}", path=feed_path)
             else:
-                self.log_warning(f"Feed not found: {feed_path}")
+                if entries is not None:
+                    self.log_success(f"Valid feed: {feed_path} ({entries} entries)")
+    
+    def _check_feed(self, feed_path, output_paths, internal_hosts):
+        """Check one feed's structure, ids, dates and links; returns the entry count"""
+        ids = set()
+        entries = 0
+        rss = False
+        errors_before = len(self.findings)
+        
+        def child_text(element, name):
+            found = element.find(f'{ATOM}{name}' if not rss else name)
+            return (found.text or '').strip() if found is not None else ''
+        
+        for event in stream_feed(str(self.index.path(feed_path))):
+            if event[0] == 'root':
+                if event[1] == 'unknown':
+                    self.log_error(f"Not an RSS or Atom feed (root element {event[2]})", path=feed_path)
+                    return None
+                rss = event[1] == 'rss'
+                continue
+            
+            if event[0] == 'feed':
+                required = RSS_CHANNEL_REQUIRED if rss else ATOM_FEED_REQUIRED
+                missing = [name for name in required if name not in event[2]]
+                if missing:
+                    self.log_error(f"Feed is missing required elements: {', '.join(missing)}", path=feed_path)
+                continue
+            
+            entry = event[1]
+            entries += 1
+            label = f"entry {entries}"
+            required = RSS_ITEM_REQUIRED if rss else ATOM_ENTRY_REQUIRED
+            missing = [name for name in required if not child_text(entry, name)]
+            if missing:
+                self.log_error(f"{label} is missing {', '.join(missing)}", path=feed_path)
+            
+            # Entry ids: Atom <id> or RSS <guid>, unique within the feed
+            entry_id = child_text(entry, 'guid' if rss else 'id')
+            if not entry_id:
+                if rss:
+                    self.log_warning(f"{label} has no <guid>", path=feed_path)
+            elif entry_id in ids:
+                self.log_error(f"Duplicate entry id {entry_id}", path=feed_path)
+            else:
+                ids.add(entry_id)
+            
+            for name in (('pubDate',) if rss else ('updated', 'published')):
+                value = child_text(entry, name)
+                if value:
+                    try:
+                        parse_feed_date(value, rss=rss)
+                    except (TypeError, ValueError):
+                        self.log_error(f"{label} has an invalid <{name}> date: {value}", path=feed_path)
+            
+            if rss:
+                links = [child_text(entry, 'link')]
+            else:
+                links = [link.get('href', '') for link in entry.findall(f'{ATOM}link')]
+                if not any(links):
+                    self.log_error(f"{label} has no <link href>", path=feed_path)
+            for link in filter(None, links):
+                # Pelican writes entry links relative to the site root, not the feed
+                resolved = resolve_reference('index.html', link, internal_hosts)
+                if resolved is None:
+                    continue
+                target = resolved[0]
+                if target not in output_paths and f"{target}/index.html" not in output_paths:
+                    self.log_error(f"{label} links to a missing page: {link}", path=feed_path)
+        
+        if entries == 0:
+            self.log_warning("Feed has no entries", path=feed_path)
+        return entries if len(self.findings) == errors_before else None
     
     def validate_live_site(self):
         """Validate the live site if server is running"""
@@ -156,39 +751,18 @@ class SiteValidator:
         
         try:
             # Test main page
-            response = requests.get(self.base_url, timeout=10)
+            response = self._get_homepage()
             if response.status_code == 200:
                 self.log_success("Site is accessible")
                 
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Check for key elements
-                if soup.find('header', class_='site-header'):
-                    self.log_success("Header is present")
-                else:
-                    self.log_error("Site header not found")
-                
-                if soup.find('main', class_='site-main'):
-                    self.log_success("Main content area is present")
-                else:
-                    self.log_error("Main content area not found")
-                
-                if soup.find('footer', class_='site-footer'):
-                    self.log_success("Footer is present")
-                else:
-                    self.log_error("Site footer not found")
-                
-                # Check for mobile menu toggle
-                if soup.find(class_='mobile-menu-toggle'):
-                    self.log_success("Mobile navigation is present")
-                else:
-                    self.log_warning("Mobile navigation not found")
-                
-                # Check for theme toggle
-                if soup.find(class_='theme-toggle'):
-                    self.log_success("Theme toggle is present")
-                else:
-                    self.log_warning("Theme toggle not found")
+                soup = BeautifulSoup(response.text, HTML_PARSER)
+                errors, warnings = check_page_layout(soup, accessibility=False)
+                for error in errors:
+                    self.log_error(error)
+                for warning in warnings:
+                    self.log_warning(warning)
+                if not errors:
+                    self.log_success("Header, main content area and footer are present")
                 
             else:
                 self.log_error(f"Site returned status code: {response.status_code}")
@@ -198,130 +772,476 @@ class SiteValidator:
         except Exception as e:
             self.log_error(f"Error validating live site: {e}")
     
+    def _session(self):
+        """Keep-alive session pooled for the crawl concurrency"""
+        if not hasattr(self, 'session'):
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+        return self.session
+    
+    def _internal_hosts(self):
+        """Hosts whose absolute links point into this site: base URL, SITE_URL and their www. forms"""
+        hosts = {urlparse(url).netloc.lower() for url in (self.base_url, self.site_url) if url}
+        return hosts | {f"www.{host}" for host in hosts if not host.startswith('www.')}
+    
+    def _rebase(self, url):
+        """Move an internal absolute URL (e.g. on SITE_URL) onto the base URL"""
+        parsed = urlparse(url)
+        return urljoin(self.base_url, (parsed.path or '/') + (f"?{parsed.query}" if parsed.query else ''))
+    
+    def _get_homepage(self):
+        """Fetch the homepage once and share it between the live checks"""
+        if self._homepage is None:
+            self._homepage = self._session().get(self.base_url, timeout=10)
+        return self._homepage
+    
+    def _sitemap_urls(self):
+        """Page URLs from output/sitemap.xml, rebased onto the base URL"""
+        if not self.index.exists("sitemap.xml"):
+            return []
+        sitemap = self.index.path("sitemap.xml")
+        urls = []
+        for _, element in ET.iterparse(sitemap):
+            if element.tag.endswith('loc') and element.text:
+                urls.append(self._rebase(element.text.strip()))
+            element.clear()
+        return urls
+    
+    def _crawl_page(self, url):
+        """Fetch and check one page; runs in a crawler thread"""
+        start = time.perf_counter()
+        response = self._session().get(url, timeout=10, stream=True)
+        # Headers are parsed by the time get() returns with stream=True
+        ttfb = time.perf_counter() - start
+        content = response.content
+        total = time.perf_counter() - start
+        
+        result = {'status': response.status_code, 'ttfb': ttfb, 'total': total,
+                  'errors': [], 'warnings': [], 'links': []}
+        if response.status_code == 200 and 'text/html' in response.headers.get('Content-Type', ''):
+            soup = BeautifulSoup(content, HTML_PARSER)
+            result['errors'], result['warnings'] = check_page_layout(soup)
+            result['links'] = [a['href'] for a in soup.find_all('a', href=True)]
+        return result
+    
+    def validate_crawl(self):
+        """Crawl the live site from the sitemap with bounded concurrency and latency stats"""
+        print(f"\n🕷 Crawling {self.base_url} ({self.concurrency} concurrent, up to {self.max_pages} pages)...")
+        start = time.perf_counter()
+        internal_hosts = self._internal_hosts()
+        self._session()
+        
+        seeds = self._sitemap_urls() or [self._rebase(self.base_url)]
+        queue = deque()
+        seen = set()
+        for url in seeds:
+            if url not in seen:
+                seen.add(url)
+                queue.append(url)
+        
+        latencies = {}
+        findings = {}
+        fetched = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            in_flight = {}
+            while queue or in_flight:
+                while queue and len(in_flight) < self.concurrency and fetched + len(in_flight) < self.max_pages:
+                    url = queue.popleft()
+                    in_flight[executor.submit(self._crawl_page, url)] = url
+                if not in_flight:
+                    break
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = in_flight.pop(future)
+                    fetched += 1
+                    path = urlparse(url).path or '/'
+                    try:
+                        result = future.result()
+                    except requests.exceptions.ConnectionError:
+                        self.log_warning(f"Could not connect to {url} (server may not be running)")
+                        queue.clear()
+                        continue
+                    except Exception as e:
+                        findings.setdefault(('error', f"Error fetching page: {e}"), set()).add(path)
+                        continue
+                    
+                    latencies.setdefault(url_pattern(url), []).append((result['ttfb'], result['total']))
+                    if result['status'] != 200:
+                        findings.setdefault(('error', f"Status {result['status']}"), set()).add(path)
+                    for message in result['errors']:
+                        findings.setdefault(('error', message), set()).add(path)
+                    for message in result['warnings']:
+                        findings.setdefault(('warning', message), set()).add(path)
+                    
+                    # Follow internal links, ignoring fragments; absolute links to
+                    # SITE_URL (as in publish output) are rebased onto the base URL
+                    for href in result['links']:
+                        parsed = urlparse(urljoin(url, href))
+                        if parsed.scheme not in ('http', 'https') or parsed.netloc.lower() not in internal_hosts:
+                            continue
+                        link = self._rebase(parsed.geturl())
+                        if link not in seen:
+                            seen.add(link)
+                            queue.append(link)
+        
+        for (severity, message), paths in sorted(findings.items()):
+            log = self.log_error if severity == 'error' else self.log_warning
+            log(f"{message} on {len(paths)} pages ({self._describe_sources(paths)})")
+        
+        if latencies:
+            print(f"\n   {'URL pattern':<40} {'pages':>6} {'TTFB p50/p95/p99 (ms)':>24} {'total p50/p95/p99 (ms)':>24}")
+            for pattern, samples in sorted(latencies.items()):
+                ttfbs = sorted(ttfb for ttfb, _ in samples)
+                totals = sorted(total for _, total in samples)
+                ttfb_stats = '/'.join(f"{percentile(ttfbs, p) * 1000:.0f}" for p in (0.5, 0.95, 0.99))
+                total_stats = '/'.join(f"{percentile(totals, p) * 1000:.0f}" for p in (0.5, 0.95, 0.99))
+                print(f"   {pattern:<40} {len(samples):>6} {ttfb_stats:>24} {total_stats:>24}")
+        
+        elapsed = time.perf_counter() - start
+        self.files_checked = fetched
+        self.log_success(f"Crawled {fetched} pages in {elapsed:.2f}s")
+    
     def validate_performance(self):
         """Basic performance validation"""
         print("\n⚡ Validating performance...")
         
         # Check file sizes
         large_files = []
-        for file_path in self.output_dir.rglob("*"):
-            if file_path.is_file():
-                size_mb = file_path.stat().st_size / (1024 * 1024)
-                if size_mb > 1:  # Files larger than 1MB
-                    large_files.append((file_path.relative_to(self.output_dir), size_mb))
+        all_files = sorted(self.index.files())
+        self.files_checked = len(all_files)
+        for file_path in all_files:
+            size_mb = self.index.size(file_path) / (1024 * 1024)
+            if size_mb > 1:  # Files larger than 1MB
+                large_files.append((file_path, size_mb))
         
         if large_files:
-            self.log_warning(f"Found {len(large_files)} files larger than 1MB:")
+            print(f"   Found {len(large_files)} files larger than 1MB:")
             for file_path, size in large_files:
-                print(f"   - {file_path}: {size:.2f}MB")
+                self.log_warning(f"Larger than 1MB ({size:.2f}MB)", path=file_path)
         else:
             self.log_success("No excessively large files found")
         
         # Check CSS/JS minification (basic check)
-        main_css = self.output_dir / "theme/css/base.css"
-        if main_css.exists():
-            with open(main_css, 'r', encoding='utf-8') as f:
+        if self.index.exists("theme/css/base.css"):
+            with open(self.index.path("theme/css/base.css"), 'r', encoding='utf-8') as f:
                 content = f.read()
                 if len(content.splitlines()) > 1000:
                     self.log_warning("CSS files might benefit from minification")
                 else:
                     self.log_success("CSS file size looks reasonable")
     
+    def validate_page_weight(self):
+        """Check every page's total weight, requests and origins against the budget"""
+        print("\n⚖️  Analyzing page weight...")
+        start = time.perf_counter()
+        
+        pages = [page for batch in self._map_batches(collect_resources_batch, self._html_files()) for page in batch]
+        
+        try:
+            budget = load_budget(self.budget_path) if self.budget_path else {'default': {}, 'pages': {}}
+        except (OSError, ValueError) as e:
+            self.log_warning(f"Could not read page budget {self.budget_path}: {e}")
+            budget = {'default': {}, 'pages': {}}
+        
+        internal_hosts = self._internal_hosts()
+        
+        # Shared assets are sized and compressed once, not once per page
+        sizes = {}
+        def asset_size(path):
+            if path not in sizes:
+                if not self.index.exists(path) or self.index.is_dir(path):
+                    sizes[path] = None
+                    return None
+                try:
+                    with open(self.index.path(path), 'rb') as f:
+                        content = f.read()
+                    sizes[path] = (len(content), len(gzip.compress(content, compresslevel=6)))
+                except OSError:
+                    sizes[path] = None
+            return sizes[path]
+        
+        report = {}
+        over_budget = 0
+        for rel_path, page_bytes, page_compressed, resources in sorted(pages):
+            total, compressed = page_bytes, page_compressed
+            origins = set()
+            requests_made = 1
+            render_blocking = 0
+            for kind, reference, blocking in resources:
+                if reference.startswith('data:'):
+                    continue
+                requests_made += 1
+                render_blocking += blocking
+                resolved = resolve_reference(rel_path, reference, internal_hosts)
+                if resolved is None:
+                    origins.add(urlparse(urljoin('https://localhost/', reference)).netloc)
+                    continue
+                size = asset_size(resolved[0])
+                if size:
+                    total += size[0]
+                    compressed += size[1]
+            
+            stats = {
+                'total_bytes': total,
+                'compressed_bytes': compressed,
+                'requests': requests_made,
+                'render_blocking': render_blocking,
+                'origins': 1 + len(origins),
+                'third_party_origins': sorted(origins)
+            }
+            report[rel_path] = stats
+            
+            limits = page_budget(budget, rel_path)
+            exceeded = [
+                f"{metric} {stats[metric]:,} > {limit:,}"
+                for metric, limit in limits.items() if metric in stats and stats[metric] > limit
+            ]
+            if exceeded:
+                over_budget += 1
+                self.log_warning(f"Over page budget ({', '.join(exceeded)})", path=rel_path)
+        
+        self._compare_weight_report(report)
+        if self.weight_report:
+            try:
+                Path(self.weight_report).parent.mkdir(parents=True, exist_ok=True)
+                with open(self.weight_report, 'w', encoding='utf-8') as f:
+                    json.dump({'generated_at': time.time(), 'pages': report}, f, indent=2)
+            except OSError as e:
+                self.log_warning(f"Could not write page weight report: {e}")
+        
+        elapsed = time.perf_counter() - start
+        self.files_checked = len(pages)
+        if report:
+            heaviest = max(report.items(), key=lambda item: item[1]['compressed_bytes'])
+            self.log_success(
+                f"Analyzed {len(report)} pages in {elapsed:.2f}s, {over_budget} over budget; heaviest "
+                f"{heaviest[0]} at {heaviest[1]['compressed_bytes'] / 1024:.0f}KB compressed"
+            )
+    
+    def _compare_weight_report(self, report, threshold=0.1):
+        """Warn about pages that grew more than threshold since the previous report"""
+        try:
+            with open(self.weight_report, 'r', encoding='utf-8') as f:
+                previous = json.load(f).get('pages', {})
+        except (OSError, ValueError, TypeError):
+            return
+        
+        for rel_path, stats in report.items():
+            before = previous.get(rel_path, {}).get('compressed_bytes')
+            if before and stats['compressed_bytes'] > before * (1 + threshold):
+                self.log_warning(
+                    f"Compressed weight grew {before / 1024:.0f}KB -> "
+                    f"{stats['compressed_bytes'] / 1024:.0f}KB since the last run",
+                    path=rel_path
+                )
+    
     def validate_accessibility(self):
         """Basic accessibility validation"""
         print("\n♿ Validating accessibility...")
         
         try:
-            response = requests.get(self.base_url, timeout=10)
+            response = self._get_homepage()
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Check for alt attributes on images
-                images = soup.find_all('img')
-                images_without_alt = [img for img in images if not img.get('alt')]
-                
-                if images_without_alt:
-                    self.log_warning(f"Found {len(images_without_alt)} images without alt attributes")
-                else:
-                    self.log_success("All images have alt attributes")
-                
-                # Check for semantic HTML
-                if soup.find('main'):
-                    self.log_success("Uses semantic <main> element")
-                else:
-                    self.log_warning("Missing semantic <main> element")
-                
-                if soup.find('nav'):
-                    self.log_success("Uses semantic <nav> element")
-                else:
-                    self.log_warning("Missing semantic <nav> element")
-                
-                # Check for skip links
-                skip_link = soup.find('a', href='#main-content')
-                if skip_link:
-                    self.log_success("Has skip to main content link")
-                else:
-                    self.log_warning("Missing skip to main content link")
+                soup = BeautifulSoup(response.text, HTML_PARSER)
+                _, warnings = check_page_layout(soup, structure=False)
+                for warning in warnings:
+                    self.log_warning(warning)
+                if not warnings:
+                    self.log_success("Has <nav>, a skip to main content link and alt text on every image")
                 
         except Exception as e:
             self.log_warning(f"Could not validate accessibility: {e}")
     
+    def run_check(self, check_id, check):
+        """Run one check, recording its wall time, file count and optional profile"""
+        self.current_check = check_id
+        self.files_checked = 0
+        profiler = cProfile.Profile() if self.profile_dir else None
+        start = time.perf_counter()
+        
+        if profiler:
+            profiler.enable()
+        try:
+            check()
+        finally:
+            if profiler:
+                profiler.disable()
+            elapsed = time.perf_counter() - start
+            self.checks[check_id] = {'time': elapsed, 'files': self.files_checked}
+            self.current_check = None
+        
+        if profiler:
+            Path(self.profile_dir).mkdir(parents=True, exist_ok=True)
+            profile_path = Path(self.profile_dir) / f"{check_id}.prof"
+            profiler.dump_stats(profile_path)
+            print(f"   Profile written to {profile_path}")
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(5)
+    
+    def write_json_report(self, path, success):
+        """Write checks and findings as JSON"""
+        report = {
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'output_dir': str(self.output_dir),
+            'base_url': self.base_url,
+            'success': success,
+            'total_time': self.timings.get('total'),
+            'checks': [
+                {
+                    'id': check_id,
+                    'time': result['time'],
+                    'files': result['files'],
+                    'errors': sum(1 for f in self.findings if f.check == check_id and f.severity == 'error'),
+                    'warnings': sum(1 for f in self.findings if f.check == check_id and f.severity == 'warning')
+                }
+                for check_id, result in self.checks.items()
+            ],
+            'findings': [finding._asdict() for finding in self.findings]
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    
+    def write_junit_report(self, path):
+        """Write one JUnit test case per check; errors fail it, warnings go to system-out"""
+        suite = ET.Element('testsuite', {
+            'name': 'validate-site',
+            'tests': str(len(self.checks)),
+            'failures': str(sum(
+                1 for check_id in self.checks
+                if any(f.check == check_id and f.severity == 'error' for f in self.findings)
+            )),
+            'time': f"{sum(result['time'] for result in self.checks.values()):.3f}"
+        })
+        for check_id, result in self.checks.items():
+            case = ET.SubElement(suite, 'testcase', {
+                'classname': 'validate-site',
+                'name': check_id,
+                'time': f"{result['time']:.3f}"
+            })
+            errors = [self._describe(f) for f in self.findings if f.check == check_id and f.severity == 'error']
+            warnings = [self._describe(f) for f in self.findings if f.check == check_id and f.severity == 'warning']
+            if errors:
+                failure = ET.SubElement(case, 'failure', {'message': f"{len(errors)} errors", 'type': 'error'})
+                failure.text = '\n'.join(errors)
+            if warnings:
+                ET.SubElement(case, 'system-out').text = '\n'.join(warnings)
+        
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tree = ET.ElementTree(ET.Element('testsuites'))
+        tree.getroot().append(suite)
+        tree.write(path, encoding='utf-8', xml_declaration=True)
+    
     def generate_report(self):
         """Generate a summary report"""
         print("\n" + "="*60)
         print("                 VALIDATION REPORT")
         print("="*60)
         
-        total_issues = len(self.errors) + len(self.warnings)
+        errors = self.errors
+        warnings = self.warnings
+        total_issues = len(errors) + len(warnings)
         
-        if len(self.errors) == 0:
+        if len(errors) == 0:
             print("✅ No critical errors found!")
         else:
-            print(f"❌ Found {len(self.errors)} critical errors:")
-            for error in self.errors:
+            print(f"❌ Found {len(errors)} critical errors:")
+            for error in errors:
                 print(f"   - {error}")
         
-        if len(self.warnings) == 0:
+        if len(warnings) == 0:
             print("✅ No warnings!")
         else:
-            print(f"⚠️  Found {len(self.warnings)} warnings:")
-            for warning in self.warnings:
+            print(f"⚠️  Found {len(warnings)} warnings:")
+            for warning in warnings:
                 print(f"   - {warning}")
         
         print(f"\nTotal issues: {total_issues}")
         
-        if len(self.errors) == 0:
+        if 'index' in self.timings:
+            count, elapsed = self.timings['index']
+            print(f"Output index: {count} entries in {elapsed:.2f}s")
+        if self.checks:
+            print(f"\n   {'Check':<16} {'files':>8} {'time':>9}")
+            for check_id, result in self.checks.items():
+                print(f"   {check_id:<16} {result['files']:>8} {result['time']:>8.2f}s")
+            print(f"   ({self.jobs} jobs, {HTML_PARSER} parser)")
+        if 'total' in self.timings:
+            print(f"Total wall time: {self.timings['total']:.2f}s")
+        
+        if len(errors) == 0:
             print("\n🚀 Site is ready for deployment!")
             return True
         else:
             print("\n🛑 Please fix critical errors before deployment.")
             return False
     
-    def run_all_validations(self):
+    def run_all_validations(self, json_report=None, junit_report=None):
         """Run all validations"""
         print("🔍 Starting comprehensive site validation...")
         print(f"Output directory: {self.output_dir}")
         print(f"Base URL: {self.base_url}")
+        start = time.perf_counter()
         
-        self.validate_file_structure()
-        self.validate_html_pages()
-        self.validate_css_js_files()
-        self.validate_feeds()
-        self.validate_live_site()
-        self.validate_performance()
-        self.validate_accessibility()
+        self.run_check('file_structure', self.validate_file_structure)
+        self.run_check('html_pages', self.validate_html_pages)
+        self.run_check('links', self.validate_links)
+        self.run_check('css_js', self.validate_css_js_files)
+        self.run_check('feeds', self.validate_feeds)
+        if self.crawl:
+            self.run_check('crawl', self.validate_crawl)
+        else:
+            self.run_check('live_site', self.validate_live_site)
+        self.run_check('performance', self.validate_performance)
+        self.run_check('page_weight', self.validate_page_weight)
+        if not self.crawl:
+            self.run_check('accessibility', self.validate_accessibility)
         
-        return self.generate_report()
+        self.timings['total'] = time.perf_counter() - start
+        success = self.generate_report()
+        
+        if json_report:
+            self.write_json_report(json_report, success)
+            print(f"JSON report written to {json_report}")
+        if junit_report:
+            self.write_junit_report(junit_report)
+            print(f"JUnit report written to {junit_report}")
+        return success
 
 def main():
     """Main function"""
-    if len(sys.argv) > 1:
-        base_url = sys.argv[1]
-    else:
-        base_url = "http://localhost:8000"
+    parser = argparse.ArgumentParser(description="Validate the generated site")
+    parser.add_argument("base_url", nargs="?", default="http://localhost:8000",
+                        help="URL of the running site (default: http://localhost:8000)")
+    parser.add_argument("--output-dir", default="output", help="Generated site directory (default: output)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="Worker processes for HTML validation (default: CPU count)")
+    parser.add_argument("--manifest", default="cache/validation-manifest.json",
+                        help="Per-file verdicts reused for unchanged files (default: cache/validation-manifest.json)")
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and re-validate every file")
+    parser.add_argument("--site-url", default=SITE_URL,
+                        help=f"Production URL whose absolute links are checked as internal (default: {SITE_URL})")
+    parser.add_argument("--crawl", action="store_true",
+                        help="Crawl the live site from sitemap.xml and report latency percentiles")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent requests while crawling (default: 8)")
+    parser.add_argument("--max-pages", type=int, default=1000, help="Most pages fetched while crawling (default: 1000)")
+    parser.add_argument("--budget", default="scripts/page-budget.json",
+                        help="Page weight budget file (default: scripts/page-budget.json)")
+    parser.add_argument("--weight-report", default="cache/page-weight.json",
+                        help="Where to write per-page weight JSON (default: cache/page-weight.json)")
+    parser.add_argument("--json-report", help="Write checks and findings as JSON to this path")
+    parser.add_argument("--junit-report", help="Write a JUnit XML report to this path")
+    parser.add_argument("--profile", metavar="DIR", help="Dump per-check cProfile stats into DIR")
+    args = parser.parse_args()
     
-    validator = SiteValidator(base_url=base_url)
-    success = validator.run_all_validations()
+    validator = SiteValidator(base_url=args.base_url, output_dir=args.output_dir, jobs=args.jobs,
+                              manifest_path=args.manifest, full=args.full, site_url=args.site_url,
+                              crawl=args.crawl, concurrency=args.concurrency, max_pages=args.max_pages,
+                              budget_path=args.budget, weight_report=args.weight_report,
+                              profile_dir=args.profile)
+    success = validator.run_all_validations(json_report=args.json_report, junit_report=args.junit_report)
     
     sys.exit(0 if success else 1)
 
@@ -0,0 +1,14 @@
+"""
+Shared pytest setup
+Puts plugins/ on sys.path the way PLUGIN_PATHS does for Pelican, so the
+plugins import each other (and are imported here) as top-level packages
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLUGINS = os.path.join(ROOT, 'plugins')
+
+if PLUGINS not in sys.path:
+    sys.path.insert(0, PLUGINS)
@@ -0,0 +1,182 @@
+"""
+The GitHub and YouTube plugins fetch their data once per build
+
+Pelican sends generator_init for every generator, so a fetch hooked to it
+runs several times per build. Requests are counted at
+requests.Session.request, below the shared API client, and every logical
+resource must be requested exactly once.
+"""
+
+import os
+import json
+from collections import Counter
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+import pytest
+
+pytest.importorskip('pelican')
+requests = pytest.importorskip('requests')
+
+from pelican import signals
+from pelican.settings import read_settings
+from requests.structures import CaseInsensitiveDict
+
+import api_client.client
+from github_integration import github_plugin
+from youtube_integration import youtube_plugin
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GITHUB_USER = 'bhowiebkr'
+REPOS = ('node-editor', 'cnc-tools')
+
+GITHUB_RESPONSES = {
+    f'/users/{GITHUB_USER}': (200, {
+        'login': GITHUB_USER, 'name': 'Bryan Howard', 'public_repos': 2, 'followers': 1,
+        'following': 1, 'avatar_url': 'https://avatars.githubusercontent.com/u/1',
+        'html_url': f'https://github.com/{GITHUB_USER}',
+        'created_at': '2015-01-01T00:00:00Z', 'updated_at': '2025-01-01T00:00:00Z'
+    }),
+    f'/users/{GITHUB_USER}/repos': (200, [
+        {
+            'name': name, 'full_name': f'{GITHUB_USER}/{name}', 'description': '',
+            'html_url': f'https://github.com/{GITHUB_USER}/{name}',
+            'clone_url': f'https://github.com/{GITHUB_USER}/{name}.git', 'language': 'Python',
+            'stargazers_count': 10, 'watchers_count': 10, 'forks_count': 1,
+            'open_issues_count': 0, 'size': 100, 'default_branch': 'main', 'topics': [],
+            'created_at': '2020-01-01T00:00:00Z', 'updated_at': '2025-01-01T00:00:00Z',
+            'pushed_at': '2025-01-01T00:00:00Z', 'fork': False, 'private': False, 'archived': False
+        }
+        for name in REPOS
+    ]),
+    f'/users/{GITHUB_USER}/events/public': (200, [])
+}
+for name in REPOS:
+    GITHUB_RESPONSES[f'/repos/{GITHUB_USER}/{name}'] = (200, {'license': None})
+    GITHUB_RESPONSES[f'/repos/{GITHUB_USER}/{name}/languages'] = (200, {'Python': 1000})
+    GITHUB_RESPONSES[f'/repos/{GITHUB_USER}/{name}/releases/latest'] = (404, {'message': 'Not Found'})
+
+YOUTUBE_RESPONSES = {
+    '/youtube/v3/channels': (200, {'items': [{
+        'id': 'UC123',
+        'contentDetails': {'relatedPlaylists': {'uploads': 'UU123'}},
+        'statistics': {'subscriberCount': '10', 'videoCount': '2', 'viewCount': '100'},
+        'snippet': {'title': 'Bryan Howard', 'description': '', 'thumbnails': {}}
+    }]}),
+    '/youtube/v3/playlistItems': (200, {'items': [
+        {'snippet': {
+            'resourceId': {'videoId': video_id}, 'title': video_id, 'description': '',
+            'thumbnails': {}, 'publishedAt': '2025-01-01T00:00:00Z'
+        }}
+        for video_id in ('vid1', 'vid2')
+    ]}),
+    '/youtube/v3/videos': (200, {'items': [
+        {'id': video_id, 'contentDetails': {'duration': 'PT1M'}, 'statistics': {'viewCount': '5'}}
+        for video_id in ('vid1', 'vid2')
+    ]}),
+    '/youtube/v3/playlists': (200, {'items': []})
+}
+
+RESPONSES = {
+    'api.github.com': GITHUB_RESPONSES,
+    'www.googleapis.com': YOUTUBE_RESPONSES
+}
+
+
+def make_response(url, status_code, data):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+    response._content = json.dumps(data).encode('utf-8')
+    return response
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Stub the network and count requests per (method, host, path)"""
+    counter = Counter()
+
+    def request(session, method, url, **kwargs):
+        parts = urlsplit(url)
+        counter[(method, parts.netloc, parts.path)] += 1
+        status_code, data = RESPONSES[parts.netloc][parts.path]
+        return make_response(url, status_code, data)
+
+    monkeypatch.setattr(requests.Session, 'request', request)
+    return counter
+
+
+@pytest.fixture
+def pelican(tmp_path, monkeypatch):
+    """A Pelican stand-in with fresh caches and both plugins registered"""
+    monkeypatch.setenv('YOUTUBE_API_KEY', 'test-key')
+    monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+    monkeypatch.delenv('API_RECORD_MODE', raising=False)
+
+    # Clients, build data and the quota ledger are process-wide
+    monkeypatch.setattr(api_client.client, '_clients', {})
+    monkeypatch.setattr(github_plugin, '_build_data', {})
+    monkeypatch.setattr(youtube_plugin, '_build_data', {})
+    monkeypatch.setattr(youtube_plugin, '_quota_ledger', None)
+
+    (tmp_path / 'content').mkdir()
+    settings = read_settings(override={
+        'PATH': str(tmp_path / 'content'),
+        'OUTPUT_PATH': str(tmp_path / 'output'),
+        'CACHE_PATH': str(tmp_path / 'cache'),
+        'THEME': f'{ROOT}/theme',
+        'GITHUB_USERNAME': GITHUB_USER,
+        'YOUTUBE_CHANNEL_USERNAME': 'BryanHoward',
+        'API_CLIENT_RATES': {'api.github.com': 1000, 'www.googleapis.com': 1000}
+    })
+
+    github_plugin.register()
+    youtube_plugin.register()
+    yield SimpleNamespace(
+        settings=settings,
+        path=settings['PATH'],
+        theme=settings['THEME'],
+        output_path=settings['OUTPUT_PATH']
+    )
+    for receiver in (github_plugin.fetch_github_data, youtube_plugin.fetch_youtube_data):
+        signals.initialized.disconnect(receiver)
+    for receiver in (github_plugin.add_github_data, youtube_plugin.add_youtube_data):
+        signals.generator_init.disconnect(receiver)
+    signals.content_object_init.disconnect(youtube_plugin.rewrite_content)
+    signals.finalized.disconnect(youtube_plugin.report_quota)
+
+
+def expected_calls():
+    return {
+        ('GET', host, path)
+        for host, responses in RESPONSES.items()
+        for path in responses
+    }
+
+
+def test_one_request_per_resource(pelican, calls):
+    signals.initialized.send(pelican)
+    generators = [SimpleNamespace(context={}) for _ in range(5)]
+    for generator in generators:
+        signals.generator_init.send(generator)
+
+    assert set(calls) == expected_calls()
+    assert all(count == 1 for count in calls.values()), calls
+
+
+def test_generator_init_only_shares_data(pelican, calls):
+    signals.initialized.send(pelican)
+    fetched = sum(calls.values())
+
+    generators = [SimpleNamespace(context={}) for _ in range(5)]
+    for generator in generators:
+        signals.generator_init.send(generator)
+
+    assert sum(calls.values()) == fetched
+    for generator in generators:
+        assert generator.context['github'] is generators[0].context['github']
+        assert generator.context['youtube'] is generators[0].context['youtube']
+    assert [repo['name'] for repo in generators[0].context['github']['repositories']] == list(REPOS)
+    assert [video['id'] for video in generators[0].context['youtube']['videos']] == ['vid1', 'vid2']
@@ -0,0 +1,117 @@
+"""
+The GraphQL backend produces the REST backend's data shape
+
+tests/fixtures/github-api.json holds recorded REST responses and the
+GraphQL response for the same user and repositories. Both backends are
+run against it, and github-section.html and the repository scoring must
+see the same keys with the same types either way.
+"""
+
+import os
+import json
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+import pytest
+
+pytest.importorskip('pelican')
+requests = pytest.importorskip('requests')
+
+from pelican.settings import read_settings
+from requests.structures import CaseInsensitiveDict
+
+import api_client.client
+from github_integration.github_plugin import GitHubDataGenerator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE = os.path.join(ROOT, 'tests', 'fixtures', 'github-api.json')
+GITHUB_USER = 'bhowiebkr'
+
+
+def load_fixture():
+    with open(FIXTURE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def make_response(url, status_code, data):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+    response._content = json.dumps(data).encode('utf-8')
+    return response
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    """A GitHub generator whose requests are answered from the fixture"""
+    fixture = load_fixture()
+
+    def request(session, method, url, **kwargs):
+        path = urlsplit(url).path
+        if method == 'POST' and path == '/graphql':
+            return make_response(url, 200, fixture['graphql'])
+        status_code, data = fixture['rest'][path]
+        return make_response(url, status_code, data)
+
+    monkeypatch.setattr(requests.Session, 'request', request)
+    monkeypatch.delenv('API_RECORD_MODE', raising=False)
+    monkeypatch.setattr(api_client.client, '_clients', {})
+
+    (tmp_path / 'content').mkdir()
+    settings = read_settings(override={
+        'PATH': str(tmp_path / 'content'),
+        'CACHE_PATH': str(tmp_path / 'cache'),
+        'THEME': os.path.join(ROOT, 'theme'),
+        'API_CLIENT_RATES': {'api.github.com': 1000}
+    })
+    return GitHubDataGenerator({}, settings, settings['PATH'], settings['THEME'], str(tmp_path / 'output'))
+
+
+def shape(data):
+    """Key -> type name, the part of the data the templates depend on"""
+    return {key: type(value).__name__ for key, value in data.items()}
+
+
+def test_profile_shapes_match(generator):
+    rest = generator._get_user_profile(GITHUB_USER, {})
+    graphql, _ = generator._get_graphql_data(GITHUB_USER, {})
+
+    assert shape(graphql) == shape(rest)
+    assert graphql == rest
+
+
+def test_repository_shapes_match(generator):
+    rest = generator._get_repositories(GITHUB_USER, {})
+    _, graphql = generator._get_graphql_data(GITHUB_USER, {})
+
+    assert [repo['name'] for repo in graphql] == [repo['name'] for repo in rest]
+    for rest_repo, graphql_repo in zip(rest, graphql):
+        assert shape(graphql_repo) == shape(rest_repo), rest_repo['name']
+        if rest_repo['latest_release']:
+            assert shape(graphql_repo['latest_release']) == shape(rest_repo['latest_release'])
+        assert graphql_repo == rest_repo
+
+
+def test_missing_fields_are_empty_strings(generator):
+    # cnc-notes has no description, language, homepage, license or release
+    _, graphql = generator._get_graphql_data(GITHUB_USER, {})
+    rest = generator._get_repositories(GITHUB_USER, {})
+
+    for repositories in (rest, graphql):
+        notes = next(repo for repo in repositories if repo['name'] == 'cnc-notes')
+        for key in ('description', 'language', 'homepage', 'license'):
+            assert notes[key] == '', key
+        assert notes['latest_release'] is None
+        assert notes['topics'] == []
+
+
+def test_scores_match(generator):
+    weights = generator._score_weights()
+    now = datetime(2025, 6, 15, tzinfo=timezone.utc)
+
+    rest = generator._get_repositories(GITHUB_USER, {})
+    _, graphql = generator._get_graphql_data(GITHUB_USER, {})
+
+    assert [generator._score_repository(repo, weights, now) for repo in graphql] == \
+        [generator._score_repository(repo, weights, now) for repo in rest]
@@ -0,0 +1,87 @@
+"""
+Remote image mirroring
+
+_encode is run on tests/fixtures/thumbnail.jpg (640x360) and must write a
+WebP per REMOTE_IMAGES_WIDTHS width plus a JPEG fallback. Offline builds
+must not touch the network.
+"""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('pelican')
+Image = pytest.importorskip('PIL.Image')
+requests = pytest.importorskip('requests')
+
+import api_client.client
+from remote_images.images_plugin import REMOTE_IMAGES_DIR, ImageMirror, mirror_remote_images
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE = os.path.join(ROOT, 'tests', 'fixtures', 'thumbnail.jpg')
+THUMBNAIL_URL = 'https://i.ytimg.com/vi/vid00000001/mqdefault.jpg'
+
+
+@pytest.fixture(autouse=True)
+def clients(monkeypatch):
+    monkeypatch.delenv('API_RECORD_MODE', raising=False)
+    monkeypatch.setattr(api_client.client, '_clients', {})
+
+
+def make_mirror(tmp_path, **settings):
+    settings.setdefault('CACHE_PATH', str(tmp_path / 'cache'))
+    return ImageMirror(settings, str(tmp_path / 'output'))
+
+
+@pytest.mark.parametrize('widths, expected', [
+    ([160, 320, 480], [160, 320, 480]),
+    # Never upscaled; the original width replaces the larger ones
+    ([320, 800, 1200], [320, 640]),
+])
+def test_encode_writes_webp_widths_and_jpeg_fallback(tmp_path, widths, expected):
+    mirror = make_mirror(tmp_path, REMOTE_IMAGES_WIDTHS=widths)
+    files_dir = tmp_path / 'files'
+    files_dir.mkdir()
+
+    image = mirror._encode('abc123', FIXTURE, str(files_dir))
+
+    assert [width for _, width in image['srcset']] == expected
+    for name, width in image['srcset']:
+        with Image.open(files_dir / name) as variant:
+            assert variant.format == 'WEBP'
+            assert variant.size == (width, round(360 * width / 640))
+
+    assert image['src'] == f'abc123-{expected[-1]}.jpg'
+    with Image.open(files_dir / image['src']) as fallback:
+        assert fallback.format == 'JPEG'
+        assert fallback.width == expected[-1]
+
+    assert sorted(image['files']) == sorted(os.listdir(files_dir))
+
+
+@pytest.mark.parametrize('settings, prefix', [
+    ({'SITEURL': '', 'RELATIVE_URLS': True}, REMOTE_IMAGES_DIR),
+    ({'SITEURL': 'https://example.com', 'RELATIVE_URLS': False}, f'https://example.com/{REMOTE_IMAGES_DIR}'),
+])
+def test_url_prefix(tmp_path, settings, prefix):
+    assert make_mirror(tmp_path, **settings).url_prefix == prefix
+
+
+def test_replay_keeps_remote_urls(tmp_path, monkeypatch):
+    def request(session, method, url, **kwargs):
+        raise AssertionError(f"unexpected request to {url}")
+
+    monkeypatch.setattr(requests.Session, 'request', request)
+    monkeypatch.setenv('API_RECORD_MODE', 'replay')
+    videos = [{'id': 'vid00000001', 'thumbnail': THUMBNAIL_URL}]
+    generator = SimpleNamespace(
+        settings={'CACHE_PATH': str(tmp_path / 'cache')},
+        context={'youtube': {'videos': videos}},
+        output_path=str(tmp_path / 'output')
+    )
+
+    mirror_remote_images([generator])
+
+    assert generator.context['youtube']['videos'] == videos
+    assert not (tmp_path / 'output').exists()
@@ -0,0 +1,98 @@
+"""
+Stale-while-revalidate snapshots keep the last good data
+
+Failed repository detail requests must not replace the details stored in
+the snapshot, and concurrent saves must always leave a complete file.
+"""
+
+import os
+import json
+import threading
+from urllib.parse import urlsplit
+
+import pytest
+
+pytest.importorskip('pelican')
+requests = pytest.importorskip('requests')
+
+from pelican.settings import read_settings
+
+import api_client.client
+from api_client import Snapshot
+from github_integration.github_plugin import GitHubDataGenerator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE = os.path.join(ROOT, 'tests', 'fixtures', 'github-api.json')
+GITHUB_USER = 'bhowiebkr'
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    """A GitHub generator whose per-repo detail requests all fail"""
+    with open(FIXTURE, 'r', encoding='utf-8') as f:
+        rest = json.load(f)['rest']
+
+    def request(session, method, url, **kwargs):
+        path = urlsplit(url).path
+        if path.startswith('/repos/'):
+            raise requests.ConnectionError(f"refused: {url}")
+        response = requests.Response()
+        response.url = url
+        response.status_code, data = rest[path]
+        response._content = json.dumps(data).encode('utf-8')
+        return response
+
+    monkeypatch.setattr(requests.Session, 'request', request)
+    monkeypatch.delenv('API_RECORD_MODE', raising=False)
+    monkeypatch.setattr(api_client.client, '_clients', {})
+
+    (tmp_path / 'content').mkdir()
+    settings = read_settings(override={
+        'PATH': str(tmp_path / 'content'),
+        'CACHE_PATH': str(tmp_path / 'cache'),
+        'THEME': os.path.join(ROOT, 'theme'),
+        'API_CLIENT_RATES': {'api.github.com': 1000},
+        'API_CLIENT_MAX_RETRIES': 0
+    })
+    return GitHubDataGenerator({}, settings, settings['PATH'], settings['THEME'], str(tmp_path / 'output'))
+
+
+def test_failed_details_keep_snapshot_values(generator):
+    previous = [{
+        'full_name': f'{GITHUB_USER}/node-editor',
+        'languages': {'Python': 1},
+        'latest_release': {'name': 'v1.0', 'tag_name': 'v1.0', 'published_at': '', 'html_url': ''},
+        'license': 'MIT License',
+        'homepage': 'https://example.com',
+        'has_issues': True,
+        'has_projects': False,
+        'has_wiki': False
+    }]
+
+    repositories = generator._get_repositories(GITHUB_USER, {}, previous_repositories=previous)
+
+    by_name = {repo['name']: repo for repo in repositories}
+    node_editor = by_name['node-editor']
+    assert node_editor['languages'] == {'Python': 1}
+    assert node_editor['latest_release']['tag_name'] == 'v1.0'
+    assert node_editor['license'] == 'MIT License'
+    # Listing fields still come from the fresh response
+    assert node_editor['stargazers_count'] == 120
+    # No snapshot details to fall back to
+    assert 'languages' not in by_name['cnc-notes']
+
+
+def test_concurrent_saves_leave_a_complete_file(tmp_path):
+    path = str(tmp_path / 'snapshots' / 'test.json')
+    snapshot = Snapshot('Test', path)
+    for index in range(50):
+        snapshot.update(f'resource-{index}', {'values': list(range(200))})
+
+    threads = [threading.Thread(target=snapshot.save) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(Snapshot('Test', path).resources) == 50
+    assert os.listdir(tmp_path / 'snapshots') == ['test.json']
@@ -0,0 +1,160 @@
+"""
+Channel feed parsing and the feed-first video source
+
+The parser is fed tests/fixtures/youtube-feed.xml in small chunks, the
+way iter_content delivers it, so entries and multi-byte characters are
+split across chunk boundaries.
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip('pelican')
+
+from pelican.settings import read_settings
+
+import api_client.client
+from youtube_integration import youtube_plugin
+from youtube_integration.feed import parse_feed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE = os.path.join(ROOT, 'tests', 'fixtures', 'youtube-feed.xml')
+FEED_IDS = ['vid00000001', 'vid00000002', 'vid00000003', 'vid00000004']
+
+
+def read_fixture():
+    with open(FIXTURE, 'rb') as f:
+        return f.read()
+
+
+def chunked(data, size, state=None):
+    """Yield data in chunks, recording how far it was read and whether it was closed"""
+    state = state if state is not None else {}
+    state.update(read=0, closed=False)
+    try:
+        for start in range(0, len(data), size):
+            state['read'] = start + size
+            yield data[start:start + size]
+    finally:
+        state['closed'] = True
+
+
+@pytest.mark.parametrize('size', [1, 7, 64, 1 << 20])
+def test_parse_feed_in_chunks(size):
+    entries = list(parse_feed(chunked(read_fixture(), size)))
+
+    assert [entry['id'] for entry in entries] == FEED_IDS
+    first = entries[0]
+    assert first['title'] == 'CNC Probe Calibration & Setup'
+    assert first['description'] == 'Calibrating a touch probe to ±0.005 mm.'
+    assert first['published_at'] == '2025-06-10T15:00:00+00:00'
+    assert first['updated_at'] == '2025-06-12T09:30:00+00:00'
+    assert first['thumbnail'] == 'https://i1.ytimg.com/vi/vid00000001/hqdefault.jpg'
+    assert (first['view_count'], first['like_count']) == (1234, 42)
+
+
+def test_missing_statistics_default_to_zero():
+    entries = {entry['id']: entry for entry in parse_feed([read_fixture()])}
+
+    assert (entries['vid00000003']['view_count'], entries['vid00000003']['like_count']) == (0, 0)
+
+
+def test_close_stops_reading_early():
+    data = read_fixture()
+    state = {}
+    chunks = chunked(data, 256, state)
+
+    entries = []
+    for entry in parse_feed(chunks):
+        entries.append(entry)
+        if len(entries) == 2:
+            chunks.close()
+            break
+
+    assert [entry['id'] for entry in entries] == FEED_IDS[:2]
+    assert state['closed']
+    assert state['read'] < len(data)
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    """A YouTube generator on the feed source with a fresh client and ledger"""
+    monkeypatch.delenv('API_RECORD_MODE', raising=False)
+    monkeypatch.setattr(api_client.client, '_clients', {})
+    monkeypatch.setattr(youtube_plugin, '_quota_ledger', None)
+
+    (tmp_path / 'content').mkdir()
+    settings = read_settings(override={
+        'PATH': str(tmp_path / 'content'),
+        'CACHE_PATH': str(tmp_path / 'cache'),
+        'THEME': f'{ROOT}/theme',
+        'YOUTUBE_VIDEO_SOURCE': 'feed'
+    })
+    generator = youtube_plugin.YouTubeDataGenerator(
+        {}, settings, settings['PATH'], settings['THEME'], str(tmp_path / 'output')
+    )
+
+    generator.feed_state = {}
+    generator.client.iter_content = lambda url, params=None: chunked(read_fixture(), 128, generator.feed_state)
+
+    generator.detail_requests = []
+
+    def get_video_details(api_key, video_ids):
+        generator.detail_requests.append(list(video_ids))
+        return {
+            video_id: {'duration': 'PT10M', 'view_count': 999, 'like_count': 99}
+            for video_id in video_ids
+        }
+
+    generator._get_video_details = get_video_details
+    return generator
+
+
+def previous_video(video_id, updated_at, **details):
+    video = {'id': video_id, 'updated_at': updated_at, 'duration': 'PT5M', 'view_count': 10, 'like_count': 1}
+    video.update(details)
+    return video
+
+
+def test_only_new_or_changed_ids_are_looked_up(generator):
+    previous = [
+        # Unchanged
+        previous_video('vid00000002', '2025-05-01T15:00:00+00:00'),
+        # Edited since the last snapshot
+        previous_video('vid00000001', '2025-06-01T00:00:00+00:00'),
+        # Unchanged, and the feed has no statistics for it
+        previous_video('vid00000003', '2025-04-01T15:00:00+00:00', view_count=321, like_count=7)
+    ]
+
+    videos = generator._get_feed_videos('key', 'UCtest', max_results=4, previous_videos=previous)
+
+    # vid00000004 is new
+    assert generator.detail_requests == [['vid00000001', 'vid00000004']]
+    by_id = {video['id']: video for video in videos}
+    assert [video['id'] for video in videos] == FEED_IDS
+    assert by_id['vid00000001']['duration'] == 'PT10M'
+    # Unchanged videos keep their details, with the feed's fresh counts when it has them
+    assert by_id['vid00000002']['duration'] == 'PT5M'
+    assert by_id['vid00000002']['view_count'] == 567
+    assert (by_id['vid00000003']['view_count'], by_id['vid00000003']['like_count']) == (321, 7)
+
+
+def test_unchanged_feed_makes_no_detail_requests(generator):
+    previous = [
+        previous_video(entry['id'], entry['updated_at'])
+        for entry in parse_feed([read_fixture()])
+    ]
+
+    generator._get_feed_videos('key', 'UCtest', max_results=4, previous_videos=previous)
+
+    assert generator.detail_requests == []
+
+
+def test_feed_is_closed_after_max_results(generator):
+    videos = generator._get_feed_videos('key', 'UCtest', max_results=2)
+
+    assert [video['id'] for video in videos] == FEED_IDS[:2]
+    assert generator.detail_requests == [FEED_IDS[:2]]
+    assert generator.feed_state['closed']
+    assert generator.feed_state['read'] < len(read_fixture())
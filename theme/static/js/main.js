@@ -594,6 +594,53 @@
         }
     }
     
+    // Click-to-load YouTube embeds: the player is only fetched on demand
+    class LiteYouTube {
+        constructor() {
+            this.facades = document.querySelectorAll('.lite-youtube');
+            this.warmed = false;
+            this.init();
+        }
+        
+        init() {
+            this.facades.forEach(facade => {
+                facade.addEventListener('pointerover', () => this.warmConnections(), { once: true });
+                facade.addEventListener('click', (e) => {
+                    e.preventDefault();
+                    this.play(facade);
+                });
+            });
+        }
+        
+        // Open connections to the player origins once the user shows intent
+        warmConnections() {
+            if (this.warmed) return;
+            this.warmed = true;
+            
+            ['https://www.youtube.com', 'https://i.ytimg.com'].forEach(origin => {
+                const link = document.createElement('link');
+                link.rel = 'preconnect';
+                link.href = origin;
+                document.head.appendChild(link);
+            });
+        }
+        
+        play(facade) {
+            const url = new URL(facade.dataset.embedUrl);
+            url.searchParams.set('autoplay', '1');
+            
+            const iframe = document.createElement('iframe');
+            iframe.src = url.toString();
+            iframe.title = facade.dataset.title || 'YouTube video';
+            iframe.allow = 'accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture';
+            iframe.allowFullscreen = true;
+            
+            facade.classList.add('lite-youtube-active');
+            facade.replaceChildren(iframe);
+            iframe.focus();
+        }
+    }
+    
     // GitHub Repository Cards Enhancement
     class GitHubEnhancements {
         constructor() {
@@ -730,6 +777,7 @@
         new FormEnhancement();
         new Analytics();
         new YouTubeEnhancements();
+        new LiteYouTube();
         new GitHubEnhancements();
         new ScrollToTop();
         